@@ -6,20 +6,46 @@ This is more reliable and faster than MoviePy
 
 import os
 import subprocess
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import json
-from datetime import datetime
 import numpy as np
+from frame_pipe import pipe_frames_to_video, slideshow_rate_args
+from fonts import get_font
+from text_sprites import TEXT_SHADOW, paste_text, paste_centered_text
+from frame_templates import template_frame, pill, centered_text
+from image_cache import load_fitted
+from motion_effects import render_slideshow_with_motion
+from transitions import render_xfade_slideshow
+from segment_cache import SegmentCache
+from layouts import Layout
+from multi_output import pipe_frames_to_outputs
+from workspace import Workspace, DEFAULT_MAX_BYTES, output_stamp
 
 class SimpleVideoCreator:
-    def __init__(self):
-        self.width = 1080  # 9:16 for TikTok/Reels
-        self.height = 1920
+    def __init__(self, in_memory=False, segment_cache=False, still_vfr=False, size='9:16',
+                 scratch_root=None, scratch_max_bytes=DEFAULT_MAX_BYTES):
+        # 9:16 for TikTok/Reels by default; layouts scale to any size
+        self.layout = Layout(size)
+        self.width, self.height = self.layout.size
         self.fps = 30
-        self.temp_dir = "temp_frames"
         
-        # Create temp directory
-        os.makedirs(self.temp_dir, exist_ok=True)
+        # Private scratch space for frames, concat lists and segments
+        # (RAM-backed when /dev/shm has room), removed by close()
+        self.workspace = Workspace('video', scratch_root, scratch_max_bytes)
+        self.temp_dir = self.workspace.path
+        
+        # Keep frames as PIL images and pipe them into FFmpeg
+        self.in_memory = in_memory
+        self.pix_fmt = 'yuv420p'
+        
+        # Recurring slides (intro, outro, CTA) are encoded once and stream-copied
+        self.segment_cache = SegmentCache() if segment_cache else None
+        
+        # Static slideshows: one frame per slide (or the lowest exact rate)
+        # instead of 30 identical frames a second; motion/transitions stay CFR
+        self.still_vfr = still_vfr
+        
+        # Create output directories
         os.makedirs("output", exist_ok=True)
         os.makedirs("screenshots", exist_ok=True)
         
@@ -30,147 +56,101 @@ class SimpleVideoCreator:
             'gemini': '#4285F4',
             'llama': '#FF6B6B'
         }
+    
+    def close(self):
+        """Delete the scratch workspace"""
+        self.workspace.close()
+    
+    def save_frame(self, img, output_path):
+        """Save a frame to disk, or hand the image back when no path is given"""
+        if output_path is None:
+            return img
+        img.save(output_path)
+        return output_path
         
-    def create_text_image(self, text_lines, output_path, bg_color='#0F0F0F', 
+    def create_text_image(self, text_lines, output_path=None, bg_color='#0F0F0F', 
                          text_color='#FFFFFF', font_size=60):
         """Create a simple text image"""
         img = Image.new('RGB', (self.width, self.height), bg_color)
-        draw = ImageDraw.Draw(img)
-        
-        # Try to use a nice font, fall back to default if not available
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
+        font_size = self.layout.s(font_size)
         
         # Calculate text positions
         y_position = self.height // 2 - (len(text_lines) * font_size)
         
         for line in text_lines:
-            # Get text dimensions
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            x_position = (self.width - text_width) // 2
-            
-            # Draw text with shadow for better visibility
-            shadow_offset = 3
-            draw.text((x_position + shadow_offset, y_position + shadow_offset), 
-                     line, fill='#000000', font=font)
-            draw.text((x_position, y_position), line, fill=text_color, font=font)
+            # Cached sprite with a drop shadow for better visibility
+            paste_centered_text(img, y_position, line, font_size, text_color,
+                                shadow=TEXT_SHADOW)
             
-            y_position += font_size + 20
+            y_position += font_size + self.layout.s(20)
         
-        img.save(output_path)
-        return output_path
+        return self.save_frame(img, output_path)
     
-    def create_screenshot_frame(self, screenshot_path, model_name, output_path):
-        """Create a frame showing a screenshot with model label"""
-        # Create base frame
-        frame = Image.new('RGB', (self.width, self.height), '#0F0F0F')
-        draw = ImageDraw.Draw(frame)
+    def screenshot_frame_template(self, model_name):
+        """Static layers of a screenshot frame: label pill and description"""
+        model_color = self.colors.get(model_name, '#FFFFFF')
         
-        # Add model label at top
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 40)
-        except:
-            font = ImageFont.load_default()
-            small_font = font
+        descriptions = {
+            'claude': "Dark mode vibes 🌙",
+            'gpt4': "Clean & minimal ✨",
+            'gemini': "Colorful energy 🎨",
+            'llama': "Open source power 🔥"
+        }
+        desc = descriptions.get(model_name, "Unique approach 🎯")
         
-        # Model name
+        L = self.layout
+        return template_frame((self.width, self.height), '#0F0F0F', (
+            pill(model_name.upper(), L.s(80), L.y(100), L.y(200), L.y(120), model_color,
+                 padding=L.s(30), radius=L.s(20)),
+            centered_text(self.height - L.y(200), desc, L.s(40), '#CCCCCC')
+        ))
+    
+    def create_screenshot_frame(self, screenshot_path, model_name, output_path=None):
+        """Create a frame showing a screenshot with model label"""
+        # Label and description come pre-rendered from the model's template
+        frame = self.screenshot_frame_template(model_name)
         model_color = self.colors.get(model_name, '#FFFFFF')
-        text = model_name.upper()
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        x_position = (self.width - text_width) // 2
-        
-        # Draw colored background for label
-        padding = 30
-        draw.rounded_rectangle(
-            [x_position - padding, 100, 
-             x_position + text_width + padding, 200],
-            radius=20,
-            fill=model_color
-        )
-        draw.text((x_position, 120), text, fill='#FFFFFF', font=font)
         
         # Load and place screenshot if it exists
         if os.path.exists(screenshot_path):
-            screenshot = Image.open(screenshot_path)
-            
-            # Resize to fit
+            # Resize to fit (decoded and resampled once per screenshot + box)
             max_width = int(self.width * 0.9)
             max_height = int(self.height * 0.6)
-            screenshot.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            screenshot = load_fitted(screenshot_path, (max_width, max_height))
             
             # Center the screenshot
             x_offset = (self.width - screenshot.width) // 2
-            y_offset = 300
-            
-            # Add a border
-            border_size = 5
-            bordered = Image.new('RGB', 
-                               (screenshot.width + 2*border_size, 
-                                screenshot.height + 2*border_size), 
-                               model_color)
-            bordered.paste(screenshot, (border_size, border_size))
+            y_offset = self.layout.y(300)
             
-            frame.paste(bordered, (x_offset - border_size, y_offset))
+            # Border: a colored rectangle just behind the screenshot
+            border_size = self.layout.s(5)
+            frame.paste(model_color, (x_offset - border_size, y_offset,
+                                      x_offset + screenshot.width + border_size,
+                                      y_offset + screenshot.height + 2*border_size))
+            frame.paste(screenshot, (x_offset, y_offset + border_size))
         else:
             # Placeholder if screenshot doesn't exist
-            draw.text((self.width//2 - 200, self.height//2), 
-                     "[Screenshot would go here]", 
-                     fill='#666666', font=small_font)
-        
-        # Add descriptive text
-        descriptions = {
-            'claude': "Dark mode vibes 🌙",
-            'gpt4': "Clean & minimal ✨",
-            'gemini': "Colorful energy 🎨",
-            'llama': "Open source power 🔥"
-        }
-        
-        desc = descriptions.get(model_name, "Unique approach 🎯")
-        bbox = draw.textbbox((0, 0), desc, font=small_font)
-        text_width = bbox[2] - bbox[0]
-        x_position = (self.width - text_width) // 2
-        draw.text((x_position, self.height - 200), desc, fill='#CCCCCC', font=small_font)
+            paste_text(frame, (self.width//2 - self.layout.s(200), self.height//2), 
+                       "[Screenshot would go here]", self.layout.s(40), '#666666')
         
-        frame.save(output_path)
-        return output_path
+        return self.save_frame(frame, output_path)
     
-    def create_comparison_grid(self, screenshots, output_path):
+    def create_comparison_grid(self, screenshots, output_path=None):
         """Create a grid showing all screenshots side by side"""
         frame = Image.new('RGB', (self.width, self.height), '#0F0F0F')
         draw = ImageDraw.Draw(frame)
+        L = self.layout
         
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-        except:
-            font = ImageFont.load_default()
-            small_font = font
+        small_font = get_font(L.s(30))
         
         # Title
-        title = "SPOT THE DIFFERENCES"
-        bbox = draw.textbbox((0, 0), title, font=font)
-        text_width = bbox[2] - bbox[0]
-        draw.text(((self.width - text_width) // 2, 80), title, fill='#FFFFFF', font=font)
-        
-        # Calculate grid layout
-        num_screenshots = len(screenshots)
-        if num_screenshots <= 2:
-            cols, rows = 1, 2
-        elif num_screenshots <= 4:
-            cols, rows = 2, 2
-        else:
-            cols, rows = 2, 3
+        paste_centered_text(frame, L.y(80), "SPOT THE DIFFERENCES", L.s(60))
+        
+        # Calculate grid layout (columns and rows swap on landscape frames)
+        cols, rows = L.grid_shape(len(screenshots))
             
         cell_width = self.width // cols
-        cell_height = (self.height - 300) // rows
+        cell_height = (self.height - L.y(300)) // rows
         
         # Place screenshots
         for idx, (model_name, screenshot_path) in enumerate(screenshots.items()):
@@ -179,40 +159,63 @@ class SimpleVideoCreator:
             
             # Cell position
             cell_x = col * cell_width
-            cell_y = 250 + row * cell_height
+            cell_y = L.y(250) + row * cell_height
             
             # Model label
             model_color = self.colors.get(model_name, '#FFFFFF')
-            draw.text((cell_x + 20, cell_y), model_name.upper(), 
-                     fill=model_color, font=small_font)
+            paste_text(frame, (cell_x + L.s(20), cell_y), model_name.upper(), L.s(30),
+                       model_color)
             
             # Mini screenshot placeholder
             preview_box = [
-                cell_x + 20,
-                cell_y + 50,
-                cell_x + cell_width - 20,
-                cell_y + cell_height - 20
+                cell_x + L.s(20),
+                cell_y + L.s(50),
+                cell_x + cell_width - L.s(20),
+                cell_y + cell_height - L.s(20)
             ]
-            draw.rectangle(preview_box, outline=model_color, width=3)
-            draw.text((cell_x + 30, cell_y + cell_height // 2), 
+            draw.rectangle(preview_box, outline=model_color, width=L.s(3))
+            draw.text((cell_x + L.s(30), cell_y + cell_height // 2), 
                      "[Preview]", fill='#666666', font=small_font)
         
         # Call to action
         cta = "Which style do YOU prefer? 👇"
-        bbox = draw.textbbox((0, 0), cta, font=font)
-        text_width = bbox[2] - bbox[0]
-        draw.text(((self.width - text_width) // 2, self.height - 150), 
-                 cta, fill='#FFFFFF', font=font)
+        paste_centered_text(frame, self.height - L.y(150), cta, L.s(60))
         
-        frame.save(output_path)
-        return output_path
+        return self.save_frame(frame, output_path)
     
     def create_video_from_images(self, image_paths, durations, output_path, 
-                                transition_duration=0.5):
-        """Use FFmpeg to create video from images"""
-        
-        # Create a concat file for FFmpeg
-        concat_file = os.path.join(self.temp_dir, "concat.txt")
+                                transition_duration=0.5, threads=None, effects=None,
+                                transition=None):
+        """Use FFmpeg to create video from images
+        
+        threads caps the encoder's thread count (see EncodeScheduler).
+        effects optionally gives a motion effect per slide, e.g.
+        {'type': 'ken_burns', 'zoom_end': 1.1} (None keeps a slide still).
+        transition ('fade', 'slide', 'wipe', 'zoom' or any xfade name) blends
+        consecutive slides over transition_duration seconds (not combinable
+        with effects).
+        """
+        if effects and any(effects) and transition:
+            raise ValueError("effects and transition can't be combined")
+        
+        # Animated slides are rendered by FFmpeg filter graphs
+        if effects and any(effects):
+            return self.create_motion_video(image_paths, durations, effects, output_path, threads)
+        
+        # Transitions: every slide chained through xfade in one FFmpeg process
+        if transition:
+            return self.create_transition_video(image_paths, durations, output_path,
+                                                transition, transition_duration, threads)
+        
+        if self.segment_cache:
+            return self.create_cached_video(image_paths, durations, output_path, threads)
+        
+        # In-memory frames skip the PNG round trip and go straight down a pipe
+        if self.in_memory or any(isinstance(img, Image.Image) for img in image_paths):
+            return self.pipe_video_from_images(image_paths, durations, output_path, threads)
+        
+        # Create a concat file for FFmpeg (one per call, encodes may run concurrently)
+        concat_file = self.workspace.unique_path('concat_', '.txt')
         with open(concat_file, 'w') as f:
             for img_path, duration in zip(image_paths, durations):
                 f.write(f"file '{os.path.abspath(img_path)}'\n")
@@ -227,10 +230,11 @@ class SimpleVideoCreator:
             '-f', 'concat',
             '-safe', '0',
             '-i', concat_file,
-            '-vf', f'fps={self.fps},format=yuv420p',
+            *slideshow_rate_args(self.fps, self.still_vfr),
             '-c:v', 'libx264',
             '-preset', 'fast',
             '-crf', '23',
+            *(['-threads', str(threads)] if threads else []),
             output_path
         ]
         
@@ -243,16 +247,102 @@ class SimpleVideoCreator:
             
             # Fallback: create simple slideshow
             print("Trying simpler approach...")
-            self.create_simple_slideshow(image_paths, durations, output_path)
+            self.create_simple_slideshow(image_paths, durations, output_path, threads)
+        finally:
+            os.remove(concat_file)
+        
+        return output_path
+    
+    def pipe_video_from_images(self, frames, durations, output_path, threads=None):
+        """Stream raw frames (PIL images or paths) into a single FFmpeg process"""
+        try:
+            pipe_frames_to_video(frames, durations, output_path,
+                                 self.width, self.height, self.fps, self.pix_fmt, threads,
+                                 still=self.still_vfr)
+            print(f"Video created successfully: {output_path}")
+        except subprocess.CalledProcessError as e:
+            print(f"Error creating video: {e}")
+            print(f"Error output: {e.stderr.decode()}")
+            raise
+        
+        return output_path
     
-    def create_simple_slideshow(self, image_paths, durations, output_path):
+    def create_multi_output_video(self, frames, durations, output_path, outputs, fit='pad',
+                                  threads=None):
+        """Render-once slideshow encoded into every size in `outputs` by one FFmpeg split
+        
+        Returns {label: path}, e.g. {'9x16': 'output/x_9x16.mp4', '1x1': ...}.
+        """
+        try:
+            paths = pipe_frames_to_outputs(frames, durations, output_path, outputs,
+                                           self.width, self.height, self.fps, self.pix_fmt,
+                                           threads, still=self.still_vfr, fit=fit)
+            print(f"Videos created successfully: {', '.join(paths.values())}")
+        except subprocess.CalledProcessError as e:
+            print(f"Error creating video: {e}")
+            print(f"Error output: {e.stderr.decode()}")
+            raise
+        
+        return paths
+    
+    def create_cached_video(self, frames, durations, output_path, threads=None):
+        """Assemble the video from cached per-slide segments with `-c copy`"""
+        try:
+            with self.workspace.scratch_file('segments_', '.txt') as list_path:
+                self.segment_cache.encode_video(
+                    frames, durations, output_path, list_path,
+                    self.fps, self.width, self.height, threads
+                )
+            print(f"Video created successfully: {output_path}")
+        except subprocess.CalledProcessError as e:
+            print(f"Error creating video: {e}")
+            print(f"Error output: {e.stderr.decode()}")
+            raise
+        
+        return output_path
+    
+    def create_motion_video(self, frames, durations, effects, output_path, threads=None):
+        """Encode animated and still slides as segments and join them with `-c copy`"""
+        try:
+            with self.workspace.scratch_dir('motion_') as segment_dir:
+                render_slideshow_with_motion(
+                    frames, durations, effects, output_path,
+                    os.path.join(segment_dir, "segments.txt"),
+                    self.fps, self.width, self.height, threads=threads,
+                    segment_dir=segment_dir, background='#0F0F0F'
+                )
+            print(f"Video created successfully: {output_path}")
+        except subprocess.CalledProcessError as e:
+            print(f"Error creating video: {e}")
+            print(f"Error output: {e.stderr.decode()}")
+            raise
+        
+        return output_path
+    
+    def create_transition_video(self, frames, durations, output_path, transition='fade',
+                                transition_duration=0.5, threads=None):
+        """Encode the slideshow as a single xfade filter graph"""
+        try:
+            with self.workspace.scratch_dir('xfade_') as temp_dir:
+                render_xfade_slideshow(frames, durations, output_path, transition,
+                                       transition_duration, self.fps, self.width, self.height,
+                                       temp_dir=temp_dir, threads=threads)
+            print(f"Video created successfully: {output_path}")
+        except subprocess.CalledProcessError as e:
+            print(f"Error creating video: {e}")
+            print(f"Error output: {e.stderr.decode()}")
+            raise
+        
+        return output_path
+    
+    def create_simple_slideshow(self, image_paths, durations, output_path, threads=None):
         """Fallback method: Create a simple slideshow without transitions"""
         
         # Create individual video segments
         segment_files = []
         
         for i, (img_path, duration) in enumerate(zip(image_paths, durations)):
-            segment_file = os.path.join(self.temp_dir, f"segment_{i}.mp4")
+            segment_file = self.workspace.unique_path(f"segment_{i}_", '.mp4')
             
             cmd = [
                 'ffmpeg',
@@ -263,6 +353,7 @@ class SimpleVideoCreator:
                 '-t', str(duration),
                 '-pix_fmt', 'yuv420p',
                 '-vf', f'scale={self.width}:{self.height}',
+                *(['-threads', str(threads)] if threads else []),
                 segment_file
             ]
             
@@ -270,7 +361,7 @@ class SimpleVideoCreator:
             segment_files.append(segment_file)
         
         # Concatenate segments
-        concat_file = os.path.join(self.temp_dir, "segments.txt")
+        concat_file = self.workspace.unique_path('segments_', '.txt')
         with open(concat_file, 'w') as f:
             for segment in segment_files:
                 f.write(f"file '{os.path.abspath(segment)}'\n")
@@ -290,56 +381,77 @@ class SimpleVideoCreator:
         # Clean up segments
         for segment in segment_files:
             os.remove(segment)
+        os.remove(concat_file)
     
-    def create_comparison_video(self, prompt_title, screenshots):
-        """Main method to create the full comparison video"""
+    def create_comparison_video(self, prompt_title, screenshots, transition=None,
+                                outputs=None, fit='pad'):
+        """Main method to create the full comparison video
+        
+        transition (e.g. 'fade') adds xfade transitions between slides.
+        outputs (e.g. ['9:16', '1:1', '16:9']) renders the slides once and
+        encodes every size in one pass, fitted by `fit` ('pad', 'crop' or
+        'blur'); the result is then {label: path}. The slides are not
+        re-composed per size; use SimpleVideoCreator(size=...) for that.
+        """
+        if outputs and transition:
+            raise ValueError("outputs and transition can't be combined")
         
         frames = []
         durations = []
         
+        # In-memory mode never touches disk for frames
+        def frame_path(name):
+            if self.in_memory:
+                return None
+            stem, ext = os.path.splitext(name)
+            return self.workspace.unique_path(f"{stem}_", ext)
+        
         # 1. Intro slide (2 seconds)
-        intro_path = os.path.join(self.temp_dir, "01_intro.png")
-        self.create_text_image(
+        intro_path = frame_path("01_intro.png")
+        intro = self.create_text_image(
             ["AI BUILD BATTLE", "", f"Challenge: {prompt_title}", "", 
              "Same prompt.", "Different vibes.", "", "🤖 ⚔️ 💻"],
             intro_path
         )
-        frames.append(intro_path)
+        frames.append(intro)
         durations.append(2)
         
         # 2. Individual model reveals (2.5 seconds each)
         for i, (model_name, screenshot_path) in enumerate(screenshots.items()):
-            frame_path = os.path.join(self.temp_dir, f"02_model_{i}_{model_name}.png")
-            self.create_screenshot_frame(screenshot_path, model_name, frame_path)
-            frames.append(frame_path)
+            frame = self.create_screenshot_frame(
+                screenshot_path, model_name, frame_path(f"02_model_{i}_{model_name}.png"))
+            frames.append(frame)
             durations.append(2.5)
         
         # 3. Comparison grid (4 seconds)
-        grid_path = os.path.join(self.temp_dir, "03_grid.png")
-        self.create_comparison_grid(screenshots, grid_path)
-        frames.append(grid_path)
+        grid = self.create_comparison_grid(screenshots, frame_path("03_grid.png"))
+        frames.append(grid)
         durations.append(4)
         
         # 4. Outro (2 seconds)
-        outro_path = os.path.join(self.temp_dir, "04_outro.png")
-        self.create_text_image(
+        outro_path = frame_path("04_outro.png")
+        outro = self.create_text_image(
             ["FOLLOW FOR MORE", "AI BATTLES", "", 
              "Drop your favorite", "in the comments!", "", 
              "🤖 💭 🎨 💻 ⚡"],
             outro_path
         )
-        frames.append(outro_path)
+        frames.append(outro)
         durations.append(2)
         
         # Create video
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = output_stamp()
         output_path = f"output/ai_battle_{prompt_title.replace(' ', '_')}_{timestamp}.mp4"
         
-        self.create_video_from_images(frames, durations, output_path)
+        if outputs:
+            output_path = self.create_multi_output_video(frames, durations, output_path,
+                                                         outputs, fit)
+        else:
+            self.create_video_from_images(frames, durations, output_path, transition=transition)
         
         # Clean up temp frames
         for frame in frames:
-            if os.path.exists(frame):
+            if isinstance(frame, str) and os.path.exists(frame):
                 os.remove(frame)
         
         return output_path
@@ -373,3 +485,5 @@ if __name__ == "__main__":
     }
     output2 = creator.create_comparison_video("Todo App", empty_screenshots)
     print(f"Created video: {output2}")
+    
+    creator.close()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Vectorized gradient backgrounds for slide builders
+Each gradient is one NumPy operation, cached per (size, gradient spec)
+"""
+
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageColor
+
+GRADIENT_KINDS = ('linear', 'radial', 'drumroll')
+
+
+def _rgb(color):
+    if isinstance(color, str):
+        return ImageColor.getrgb(color)[:3]
+    return tuple(color)
+
+
+def _profile(width, height, kind, vertical):
+    """Blend factor in [0, 1] for every pixel, as a broadcastable array"""
+    if kind == 'linear':
+        # Matches the old per-row loop: t = i / height
+        if vertical:
+            return (np.arange(height, dtype=np.float64) / height)[:, None]
+        return (np.arange(width, dtype=np.float64) / width)[None, :]
+
+    if kind == 'drumroll':
+        # Dark center, brighter towards the edges: t = |i - h/2| / (h/2)
+        if vertical:
+            half = height / 2
+            return (np.abs(np.arange(height, dtype=np.float64) - half) / half)[:, None]
+        half = width / 2
+        return (np.abs(np.arange(width, dtype=np.float64) - half) / half)[None, :]
+
+    if kind == 'radial':
+        ys = np.arange(height, dtype=np.float64)[:, None] - height / 2
+        xs = np.arange(width, dtype=np.float64)[None, :] - width / 2
+        return np.sqrt(xs ** 2 + ys ** 2) / np.hypot(width / 2, height / 2)
+
+    raise ValueError(f"Unknown gradient kind: {kind} (expected one of {GRADIENT_KINDS})")
+
+
+@lru_cache(maxsize=32)
+def _render_gradient(size, kind, start, end, vertical):
+    width, height = size
+    t = _profile(width, height, kind, vertical)
+
+    start = np.array(start, dtype=np.float64)
+    end = np.array(end, dtype=np.float64)
+    pixels = start + (end - start) * t[..., None]
+
+    # Truncate like int() did in the per-row loops
+    pixels = np.broadcast_to(pixels, (height, width, 3)).astype(np.uint8)
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
+
+
+def gradient_background(size, kind='linear', start='#0F0F0F', end='#282828', vertical=True):
+    """Fresh RGB base image with a gradient (safe to draw on)
+
+    kind: 'linear' (start -> end along the axis), 'radial' (start at the center,
+    end at the corners) or 'drumroll' (start at the center line, end at the edges).
+    """
+    return _render_gradient(tuple(size), kind, _rgb(start), _rgb(end), vertical).copy()
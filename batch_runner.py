@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Batch production of comparison videos from a manifest
+Jobs run on a bounded process pool; each job's state is kept on disk so an
+interrupted batch resumes without redoing finished jobs
+
+Manifest (JSON):
+    {
+      "defaults": {"storylines": [1, 2, 3], "options": {"still_vfr": true}},
+      "jobs": [
+        {"project": "calculator", "models": {"claude": "inputs/claude.html", ...}},
+        {"id": "todo-v2", "project": "todo", "models": {...}, "storylines": [1],
+         "outputs": ["9:16", "1:1", "16:9"]}
+      ]
+    }
+
+    python batch_runner.py manifest.json --workers 4
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import traceback
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from disk_cache import hash_file
+
+# Options every batch job starts from. In-memory frames go straight into
+# ffmpeg; anything else a job writes stays in its own scratch workspace
+# (see workspace.py; 'scratch_root'/'scratch_max_bytes' options tune it)
+DEFAULT_OPTIONS = {'in_memory': True}
+
+
+def load_manifest(path):
+    """Normalized job list: each job gets id, project, models, storylines, outputs, options
+
+    A project may appear only once: its screenshots are written to
+    screenshots/<model>_<project>.png, which concurrent jobs would share.
+    """
+    with open(path) as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {'jobs': manifest}
+
+    defaults = manifest.get('defaults', {})
+    jobs = []
+    seen = set()
+    projects = set()
+    for i, raw in enumerate(manifest.get('jobs', [])):
+        if 'project' not in raw or not raw.get('models'):
+            raise ValueError(f"Job {i} needs a 'project' and a non-empty 'models' map")
+
+        job = {
+            'id': raw.get('id', raw['project']),
+            'project': raw['project'],
+            'models': raw['models'],
+            'storylines': raw.get('storylines', defaults.get('storylines', [1])),
+            'outputs': raw.get('outputs', defaults.get('outputs')),
+            'options': {**DEFAULT_OPTIONS, **defaults.get('options', {}), **raw.get('options', {})}
+        }
+        if job['id'] in seen:
+            raise ValueError(f"Duplicate job id '{job['id']}' (set an explicit 'id')")
+        seen.add(job['id'])
+        if job['project'] in projects:
+            raise ValueError(f"Project '{job['project']}' appears in more than one job "
+                             f"(list all of its storylines in one job)")
+        projects.add(job['project'])
+        jobs.append(job)
+    return jobs
+
+
+def input_hashes(job):
+    """sha256 of every model HTML file (None for a missing file)"""
+    hashes = {}
+    for model, path in job['models'].items():
+        try:
+            hashes[model] = hash_file(path).hexdigest()
+        except FileNotFoundError:
+            hashes[model] = None
+    return hashes
+
+
+def video_paths(videos):
+    """Flat list of output files from {storyline: path or {label: path}}"""
+    paths = []
+    for video in videos.values():
+        paths.extend(video.values() if isinstance(video, dict) else [video])
+    return paths
+
+
+class JobState:
+    """Per-job state files in one directory, written atomically"""
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+        os.makedirs(state_dir, exist_ok=True)
+
+    def path_for(self, job_id):
+        safe = "".join(c if c.isalnum() or c in '-_.' else '_' for c in job_id)
+        return os.path.join(self.state_dir, f"{safe}.json")
+
+    def log_path(self, job_id):
+        return self.path_for(job_id)[:-len('.json')] + '.log'
+
+    def load(self, job_id):
+        try:
+            with open(self.path_for(job_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'id': job_id, 'status': 'pending', 'attempts': 0}
+
+    def save(self, state):
+        path = self.path_for(state['id'])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def is_done(self, job):
+        """Finished earlier with the same job and HTML contents, and its videos still exist"""
+        state = self.load(job['id'])
+        if state.get('status') != 'done' or state.get('job') != job:
+            return False
+        if state.get('inputs') != input_hashes(job):
+            return False
+        return all(os.path.exists(path) for path in video_paths(state.get('videos', {})))
+
+
+def run_job(job, log_path):
+    """Produce one job's storylines (runs in a pool worker)"""
+    from viral_content_pipeline import ViralContentPipeline
+
+    with open(log_path, 'a') as log, contextlib.redirect_stdout(log):
+        print(f"\n=== {job['id']} started {datetime.now().isoformat()} ===")
+        pipeline = ViralContentPipeline(job['project'], **job['options'])
+        try:
+            videos = pipeline.produce_all(job['models'], tuple(job['storylines']),
+                                          outputs=job['outputs'])
+        finally:
+            pipeline.close()
+
+    return {str(storyline): path for storyline, path in videos.items()}
+
+
+class BatchRunner:
+    """Run manifest jobs on a bounded worker pool with resumable state"""
+
+    def __init__(self, jobs, state_dir='batch_state', workers=2, retry_failed=True):
+        self.jobs = jobs
+        self.state = JobState(state_dir)
+        self.workers = max(1, workers)
+        self.retry_failed = retry_failed
+
+    def pending_jobs(self):
+        pending = []
+        for job in self.jobs:
+            if self.state.is_done(job):
+                continue
+            if not self.retry_failed and self.state.load(job['id']).get('status') == 'failed':
+                continue
+            pending.append(job)
+        return pending
+
+    def run(self):
+        """Run every unfinished job; returns the summary dict"""
+        pending = self.pending_jobs()
+        skipped = len(self.jobs) - len(pending)
+        print(f"📋 {len(self.jobs)} jobs: {len(pending)} to run, {skipped} skipped "
+              f"({self.workers} workers)")
+
+        started = time.perf_counter()
+        finished = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {}
+            for job in pending:
+                state = self.state.load(job['id'])
+                state.update({
+                    'job': job,
+                    'inputs': input_hashes(job),
+                    'status': 'running',
+                    'attempts': state.get('attempts', 0) + 1,
+                    'started': datetime.now().isoformat(),
+                    'error': None
+                })
+                self.state.save(state)
+                future = pool.submit(run_job, job, self.state.log_path(job['id']))
+                futures[future] = (job, state, time.perf_counter())
+
+            for future in as_completed(futures):
+                job, state, submitted = futures[future]
+                state['finished'] = datetime.now().isoformat()
+                state['wall_s'] = round(time.perf_counter() - submitted, 2)
+                try:
+                    state['videos'] = future.result()
+                    state['status'] = 'done'
+                except Exception as e:
+                    state['status'] = 'failed'
+                    state['error'] = f"{type(e).__name__}: {e}"
+                    state['traceback'] = traceback.format_exc()
+                self.state.save(state)
+                finished.append(state)
+
+                icon = '✅' if state['status'] == 'done' else '❌'
+                if state['status'] == 'done':
+                    detail = f"{len(video_paths(state['videos']))} videos"
+                else:
+                    detail = state['error']
+                print(f"{icon} [{len(finished)}/{len(pending)}] {job['id']}: {detail} "
+                      f"({state['wall_s']}s)")
+
+        summary = self.summary(finished, skipped, time.perf_counter() - started)
+        self.print_summary(summary)
+        return summary
+
+    def summary(self, finished, skipped, wall):
+        done = [s for s in finished if s['status'] == 'done']
+        videos = sum(len(video_paths(s.get('videos', {}))) for s in done)
+        return {
+            'jobs_done': len(done),
+            'jobs_failed': len(finished) - len(done),
+            'jobs_skipped': skipped,
+            'videos': videos,
+            'wall_s': round(wall, 2),
+            'avg_job_s': round(sum(s['wall_s'] for s in done) / len(done), 2) if done else None,
+            'jobs_per_hour': round(len(done) / wall * 3600, 1) if wall and done else 0.0,
+            'videos_per_hour': round(videos / wall * 3600, 1) if wall and done else 0.0,
+            'failed': [s['id'] for s in finished if s['status'] != 'done']
+        }
+
+    def print_summary(self, summary):
+        print(f"\n📊 Batch finished in {summary['wall_s']}s: {summary['jobs_done']} done, "
+              f"{summary['jobs_failed']} failed, {summary['jobs_skipped']} skipped")
+        if summary['jobs_done']:
+            print(f"   {summary['videos']} videos, {summary['videos_per_hour']} videos/hour, "
+                  f"{summary['jobs_per_hour']} jobs/hour, avg {summary['avg_job_s']}s per job")
+        if summary['failed']:
+            print(f"   ❌ Failed: {', '.join(summary['failed'])} "
+                  f"(logs in {self.state.state_dir})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Produce comparison videos from a manifest")
+    parser.add_argument('manifest', help='manifest JSON (see module docstring)')
+    parser.add_argument('--workers', type=int, default=2, help='jobs to run at once')
+    parser.add_argument('--state-dir', help='per-job state and logs '
+                                            '(default: batch_state/<manifest name>)')
+    parser.add_argument('--skip-failed', action='store_true',
+                        help="don't retry jobs that failed in an earlier run")
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)
+    state_dir = args.state_dir or os.path.join(
+        'batch_state', os.path.splitext(os.path.basename(args.manifest))[0])
+
+    runner = BatchRunner(jobs, state_dir, args.workers, retry_failed=not args.skip_failed)
+    summary = runner.run()
+    return 1 if summary['jobs_failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the frame render and encode hot paths
+Runs against fixed synthetic inputs in a scratch directory (no network),
+writes JSON results and flags regressions against a saved baseline
+
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json --threshold 0.15
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime
+
+import numpy as np
+from PIL import Image
+import PIL
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+HAS_FFMPEG = shutil.which('ffmpeg') is not None
+
+MODELS = ['claude', 'gpt4', 'gemini', 'llama']
+
+
+class Benchmark:
+    """One timed case: one cold run(), then `repeat` timed runs
+
+    setup() runs once up front, or before every run with setup_each=True
+    (for cases that must start from an empty cache each time).
+    """
+
+    def __init__(self, name, group, run, setup=None, setup_each=False, repeat=5, requires=()):
+        self.name = name
+        self.group = group
+        self.run = run
+        self.setup = setup
+        self.setup_each = setup_each
+        self.repeat = repeat
+        self.requires = requires
+
+
+def make_screenshots(directory, size=(1200, 800)):
+    """Deterministic fake page captures, one per model"""
+    rng = np.random.default_rng(1234)
+    paths = {}
+    for i, model in enumerate(MODELS):
+        # Smooth gradient with some noise, roughly as compressible as a real page
+        y, x = np.mgrid[0:size[1], 0:size[0]]
+        base = np.stack([(x * (i + 1)) % 256, (y * 2) % 256, ((x + y) // 4) % 256], axis=-1)
+        noise = rng.integers(0, 24, base.shape)
+        img = Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8))
+        path = os.path.join(directory, f"{model}.png")
+        img.save(path)
+        paths[model] = path
+    return paths
+
+
+def clear_render_caches():
+    """Empty every in-process render cache (fonts, text sprites, templates,
+    gradients, fitted screenshots) so the next render starts cold
+
+    resolve_font stays cached: it is a one-off font file probe per process.
+    """
+    from fonts import get_font
+    from text_sprites import text_bbox, _render_sprite
+    from frame_templates import _render_template
+    from backgrounds import _render_gradient
+    from image_cache import fitted_images
+
+    for cached in (get_font, text_bbox, _render_sprite, _render_template, _render_gradient):
+        cached.cache_clear()
+    fitted_images.clear()
+
+
+def uncached_variants(cases):
+    """Each render case as-is (caches cleared once, so its cold run is really
+    cold) followed by a [uncached] copy that clears them before every run"""
+    variants = []
+    for case in cases:
+        case.setup = clear_render_caches
+        variants.append(case)
+        variants.append(Benchmark(f"{case.name}[uncached]", case.group, case.run,
+                                  setup=clear_render_caches, setup_each=True,
+                                  repeat=case.repeat, requires=case.requires))
+    return variants
+
+
+def tool_available(name):
+    if name == 'ffmpeg':
+        return HAS_FFMPEG
+    if name == 'moviepy':
+        try:
+            import moviepy.editor  # noqa: F401
+        except ImportError:
+            return False
+        return True
+    return True
+
+
+def build_cases(screenshots):
+    """All benchmark cases, built against the synthetic screenshots"""
+    from automation import SimpleVideoCreator
+    from viral_content_pipeline import ViralContentPipeline
+    from video_edit_helper import VideoEditHelper
+
+    pipeline = ViralContentPipeline("bench", in_memory=True, screenshot_cache=False)
+    creator = SimpleVideoCreator(in_memory=True)
+    data = {model: {'screenshot': path, 'vibe': 'Benchmark'} for model, path in screenshots.items()}
+    scores = {'design': 8, 'usability': 7, 'creativity': 9}
+
+    render_cases = [
+        # Frame builders (in memory, so PNG encoding isn't part of the number)
+        Benchmark('create_text_frame', 'render',
+                  lambda: pipeline.create_text_frame(["Which AI", "nailed it?"], 'dramatic')),
+        Benchmark('create_personality_reveal', 'render',
+                  lambda: pipeline.create_personality_reveal('claude', data['claude'])),
+        Benchmark('create_dramatic_reveal', 'render',
+                  lambda: pipeline.create_dramatic_reveal('gpt4', data['gpt4'], "WAIT WHAT 😱")),
+        Benchmark('create_split_screen', 'render',
+                  lambda: pipeline.create_split_screen(data, "SAME PROMPT")),
+        Benchmark('create_equation_frame', 'render',
+                  lambda: pipeline.create_equation_frame("Euler's identity", "e^(iπ) + 1 = 0")),
+        Benchmark('create_scoring_frame', 'render',
+                  lambda: pipeline.create_scoring_frame('gemini', data['gemini'], scores)),
+        Benchmark('create_winner_frame', 'render', pipeline.create_winner_frame),
+        Benchmark('create_text_image', 'render',
+                  lambda: creator.create_text_image(["AI BUILD BATTLE", "", "Same prompt."])),
+        Benchmark('create_screenshot_frame', 'render',
+                  lambda: creator.create_screenshot_frame(screenshots['claude'], 'claude')),
+        Benchmark('create_comparison_grid', 'render',
+                  lambda: creator.create_comparison_grid(screenshots)),
+    ]
+    cases = uncached_variants(render_cases)
+
+    # Encode paths share one short slideshow of 4 slides
+    slides = [
+        pipeline.create_text_frame(["Hook"], 'suspense'),
+        pipeline.create_personality_reveal('claude', data['claude']),
+        pipeline.create_scoring_frame('llama', data['llama'], scores),
+        pipeline.create_winner_frame()
+    ]
+    durations = [1, 1.5, 1, 1.5]
+    slide_paths = []
+    for i, slide in enumerate(slides):
+        path = os.path.join('inputs', f"slide_{i}.png")
+        slide.save(path)
+        slide_paths.append(path)
+
+    disk_pipeline = ViralContentPipeline("bench", screenshot_cache=False)
+    disk_creator = SimpleVideoCreator()
+    still_creator = SimpleVideoCreator(still_vfr=True)
+
+    editor = VideoEditHelper("bench")
+    editor.load_timeline(slide_paths, durations)
+    editor.add_overlay_to_frame(1, "Look at this", 'bottom')
+
+    def reset_segments():
+        shutil.rmtree("edits/segments/bench", ignore_errors=True)
+        os.makedirs("edits/segments/bench", exist_ok=True)
+
+    cases += [
+        Benchmark('create_video[pipe]', 'encode',
+                  lambda: pipeline.create_video(slides, durations, 'bench_pipe', cleanup=False),
+                  repeat=3, requires=('ffmpeg',)),
+        Benchmark('create_video[concat]', 'encode',
+                  lambda: disk_pipeline.create_video(slide_paths, durations, 'bench_concat',
+                                                     cleanup=False),
+                  repeat=3, requires=('ffmpeg',)),
+        Benchmark('create_video_from_images', 'encode',
+                  lambda: disk_creator.create_video_from_images(slide_paths, durations,
+                                                                'output/bench_images.mp4'),
+                  repeat=3, requires=('ffmpeg',)),
+        Benchmark('create_video_from_images[still_vfr]', 'encode',
+                  lambda: still_creator.create_video_from_images(slide_paths, durations,
+                                                                 'output/bench_still.mp4'),
+                  repeat=3, requires=('ffmpeg',)),
+        Benchmark('create_video_from_images[fade]', 'encode',
+                  lambda: disk_creator.create_video_from_images(slide_paths, durations,
+                                                                'output/bench_fade.mp4',
+                                                                transition='fade'),
+                  repeat=3, requires=('ffmpeg',)),
+        Benchmark('create_simple_slideshow', 'encode',
+                  lambda: disk_creator.create_simple_slideshow(slide_paths, durations,
+                                                               'output/bench_simple.mp4'),
+                  repeat=3, requires=('ffmpeg',)),
+        Benchmark('rebuild_video', 'encode',
+                  lambda: editor.rebuild_video('bench_rebuild'),
+                  repeat=3, requires=('ffmpeg',)),
+        Benchmark('rebuild_video[incremental,cold]', 'encode',
+                  lambda: editor.rebuild_video('bench_incremental', incremental=True),
+                  setup=reset_segments, setup_each=True, repeat=2, requires=('ffmpeg',)),
+        Benchmark('rebuild_video[incremental,warm]', 'encode',
+                  lambda: editor.rebuild_video('bench_incremental', incremental=True),
+                  repeat=3, requires=('ffmpeg',)),
+    ]
+
+    def draft_intro():
+        from draft_automation import VideoAutomator
+        return VideoAutomator().create_intro_slide("Calculator App")
+
+    cases += uncached_variants([Benchmark('draft.create_intro_slide', 'render', draft_intro,
+                                          requires=('moviepy',))])
+    return cases
+
+
+def time_case(case, quiet=True):
+    """Cold (first call) time plus warm timings, in milliseconds"""
+    sink = io.StringIO()
+    redirect = contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext()
+    with redirect:
+        if case.setup:
+            case.setup()
+
+        start = time.perf_counter()
+        case.run()
+        cold = (time.perf_counter() - start) * 1000
+
+        samples = []
+        for _ in range(case.repeat):
+            if case.setup and case.setup_each:
+                case.setup()
+            start = time.perf_counter()
+            case.run()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'group': case.group,
+        'repeat': case.repeat,
+        'cold_ms': round(cold, 3),
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+        'stdev_ms': round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0
+    }
+
+
+def ffmpeg_version():
+    if not HAS_FFMPEG:
+        return None
+    out = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True).stdout
+    return out.splitlines()[0] if out else None
+
+
+def compare(results, baseline, threshold):
+    """Median-vs-baseline ratio per case; anything slower than 1 + threshold regresses"""
+    comparison = {}
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base or 'median_ms' not in result or 'median_ms' not in base:
+            continue
+        ratio = result['median_ms'] / base['median_ms'] if base['median_ms'] else float('inf')
+        comparison[name] = {
+            'baseline_ms': base['median_ms'],
+            'current_ms': result['median_ms'],
+            'ratio': round(ratio, 3),
+            'status': ('regression' if ratio > 1 + threshold else
+                       'improvement' if ratio < 1 - threshold else 'unchanged')
+        }
+    return comparison
+
+
+def print_report(results, comparison):
+    print(f"\n{'case':<40} {'cold':>10} {'median':>10} {'vs base':>10}")
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:<40} {'skipped: ' + result['skipped']:>32}")
+            continue
+        change = comparison.get(name)
+        icon = {'regression': ' ❌', 'improvement': ' 🚀'}.get(change['status'], '') if change else ''
+        ratio = f"{change['ratio']:.2f}x{icon}" if change else '-'
+        print(f"{name:<40} {result['cold_ms']:>8.1f}ms {result['median_ms']:>8.1f}ms {ratio:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='where to write the JSON results')
+    parser.add_argument('--baseline', help='earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed slowdown before a case counts as a regression')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--group', choices=['render', 'encode'], help='only run one group')
+    parser.add_argument('--repeat', type=int, help='override every case\'s repeat count')
+    parser.add_argument('--keep-workdir', action='store_true',
+                        help='leave the scratch directory in place for inspection')
+    args = parser.parse_args(argv)
+
+    output_path = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    # Every class writes relative to the CWD, so run in a scratch directory
+    workdir = tempfile.mkdtemp(prefix='bench_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for d in ['inputs', 'output']:
+            os.makedirs(d, exist_ok=True)
+        screenshots = make_screenshots('inputs')
+        with contextlib.redirect_stdout(io.StringIO()):
+            cases = build_cases(screenshots)
+
+        results = {}
+        for case in cases:
+            if args.filter not in case.name or (args.group and case.group != args.group):
+                continue
+            missing = [tool for tool in case.requires if not tool_available(tool)]
+            if missing:
+                results[case.name] = {'group': case.group, 'skipped': f"{', '.join(missing)} not available"}
+                continue
+            if args.repeat:
+                case.repeat = args.repeat
+            print(f"⏱️ {case.name}...", flush=True)
+            results[case.name] = time_case(case)
+    finally:
+        os.chdir(cwd)
+        if args.keep_workdir:
+            print(f"📁 Scratch directory kept: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    comparison = compare(results, baseline, args.threshold) if baseline else {}
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'pillow': PIL.__version__,
+            'numpy': np.__version__,
+            'ffmpeg': ffmpeg_version(),
+            'baseline': args.baseline,
+            'threshold': args.threshold
+        },
+        'results': results,
+        'comparison': comparison
+    }
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print_report(results, comparison)
+    print(f"\n📊 Results written to {output_path}")
+
+    regressions = [name for name, c in comparison.items() if c['status'] == 'regression']
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Persistent headless Chromium for screenshot capture
+One browser stays alive and every HTML page is captured concurrently in its own tab
+"""
+
+import asyncio
+import os
+import threading
+
+
+class BrowserPool:
+    """Long-lived Playwright Chromium driven from a background event loop"""
+
+    def __init__(self, viewport=(1200, 800), wait_ms=3000, max_pages=8,
+                 offline=False, nav_timeout_ms=15000):
+        self.viewport = viewport
+        self.wait_ms = wait_ms
+        self.max_pages = max_pages
+        self.offline = offline  # Abort every non-local request
+        self.nav_timeout_ms = nav_timeout_ms
+
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._browser = None
+        self._pages = None
+
+    def start(self):
+        """Launch Chromium once; later captures reuse it"""
+        if self._browser is not None:
+            return self
+
+        # Optional dependency: only needed for the browser capture backend
+        from playwright.async_api import async_playwright
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+        async def launch():
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._pages = asyncio.Semaphore(self.max_pages)
+
+        try:
+            self._run(launch())
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def _run(self, coro):
+        """Run a coroutine on the browser's loop and wait for the result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _route_local_only(self, route):
+        url = route.request.url
+        if url.startswith(('file:', 'data:', 'blob:')):
+            await route.continue_()
+        else:
+            await route.abort()
+
+    async def _capture(self, html_file, output_path):
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        async with self._pages:
+            width, height = self.viewport
+            page = await self._browser.new_page(viewport={'width': width, 'height': height})
+            try:
+                if self.offline:
+                    await page.route('**/*', self._route_local_only)
+
+                try:
+                    await page.goto(f"file://{os.path.abspath(html_file)}",
+                                    wait_until='load', timeout=self.nav_timeout_ms)
+                except PlaywrightTimeoutError:
+                    # Slow external assets shouldn't cost us the screenshot
+                    pass
+
+                await page.wait_for_timeout(self.wait_ms)
+                await page.screenshot(path=output_path)
+            finally:
+                await page.close()
+
+        return output_path
+
+    async def _capture_all(self, jobs):
+        return await asyncio.gather(
+            *(self._capture(html_file, output_path) for html_file, output_path in jobs),
+            return_exceptions=True
+        )
+
+    def capture_many(self, jobs):
+        """Capture [(html_file, output_path), ...] concurrently
+
+        Returns one entry per job: the output path, or the exception it raised.
+        """
+        self.start()
+        return self._run(self._capture_all(jobs))
+
+    def capture(self, html_file, output_path):
+        """Capture a single page"""
+        result = self.capture_many([(html_file, output_path)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        """Shut down Chromium and the background loop"""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+
+        try:
+            self._run(shutdown())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = self._thread = None
+            self._playwright = self._browser = self._pages = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
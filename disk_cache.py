@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk file cache with size-based LRU eviction
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+
+
+def hash_file(path, h=None, chunk_size=1 << 20):
+    """Feed a file's bytes into a hash (sha256 by default)"""
+    h = h or hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h
+
+
+class DiskLRUCache:
+    """Files stored by key; least recently used entries go first once over max_bytes"""
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024, suffix=''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}{self.suffix}")
+
+    def temp_path(self, key, suffix='.tmp'):
+        """Fresh in-flight file for key, unique per process and thread"""
+        fd, path = tempfile.mkstemp(prefix=f"{key}.", suffix=suffix, dir=self.cache_dir)
+        os.close(fd)
+        return path
+
+    def get(self, key):
+        """Cached path for key, or None (a hit counts as a use for LRU)"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def fetch(self, key, output_path):
+        """Copy a cached entry to output_path; True on a hit"""
+        path = self.get(key)
+        if path is None:
+            return False
+        shutil.copyfile(path, output_path)
+        return True
+
+    def put(self, key, src_path, move=False):
+        """Store a file under key and evict down to the size cap"""
+        path = self.path_for(key)
+        tmp_path = self.temp_path(key)
+
+        # Write aside and rename so readers never see a partial entry
+        if move:
+            shutil.move(src_path, tmp_path)
+        else:
+            shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, path)
+
+        self.evict()
+        return path
+
+    def entries(self):
+        """[(mtime, size, path), ...] for every cached file"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            # In-flight writes aren't entries yet
+            if '.tmp' in name:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Drop least recently used entries until under max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        return total
@@ -7,17 +7,30 @@ Optimized for TikTok/Reels/Shorts format (9:16 aspect ratio)
 import os
 import json
 import subprocess
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
 from moviepy.editor import *
 import numpy as np
 from datetime import datetime
+from fonts import get_font
+from text_sprites import paste_text, paste_centered_text, text_bbox
+from image_cache import load_fitted
+from backgrounds import gradient_background
+from motion_effects import render_motion_clip
+from layouts import Layout
+from multi_output import reframe_video
+from workspace import Workspace, DEFAULT_MAX_BYTES
 
 class VideoAutomator:
-    def __init__(self):
-        self.video_width = 1080  # 9:16 aspect ratio
-        self.video_height = 1920
+    def __init__(self, size='9:16', scratch_root=None, scratch_max_bytes=DEFAULT_MAX_BYTES):
+        # 9:16 aspect ratio by default; layouts scale to any size
+        self.layout = Layout(size)
+        self.video_width, self.video_height = self.layout.size
         self.fps = 30
         
+        # Private scratch space for slide images and clips (RAM-backed when
+        # /dev/shm has room) instead of temp_* files in the working directory
+        self.workspace = Workspace('draft', scratch_root, scratch_max_bytes)
+        
         # Define consistent styling
         self.colors = {
             'claude': '#6B46C1',  # Purple
@@ -30,22 +43,14 @@ class VideoAutomator:
     def create_intro_slide(self, prompt_title: str, duration: int = 2):
         """Create engaging intro slide"""
         
-        # Create base image
-        img = Image.new('RGB', (self.video_width, self.video_height), self.colors['background'])
+        # Create base image with gradient background
+        img = gradient_background((self.video_width, self.video_height), 'linear',
+                                  (15, 15, 15), (40, 40, 40))
         draw = ImageDraw.Draw(img)
+        L = self.layout
         
-        # Add gradient background
-        for i in range(self.video_height):
-            color_value = int(15 + (25 * (i / self.video_height)))
-            draw.rectangle([0, i, self.video_width, i+1], fill=(color_value, color_value, color_value))
-        
-        # Load fonts (you'll need to have these)
-        try:
-            title_font = ImageFont.truetype("Arial-Bold.ttf", 80)
-            subtitle_font = ImageFont.truetype("Arial.ttf", 50)
-        except:
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
+        # Load fonts from the shared cache
+        title_font = get_font(L.s(80), 'bold')
         
         # Add text with shadow effect
         title_text = "AI BUILD BATTLE"
@@ -55,30 +60,27 @@ class VideoAutomator:
         # Center text
         bbox = draw.textbbox((0, 0), title_text, font=title_font)
         x = (self.video_width - (bbox[2] - bbox[0])) // 2
+        title_y = L.y(600)
         
         # Title with glow effect
         for offset in range(3, 0, -1):
-            draw.text((x-offset, 600-offset), title_text, 
+            draw.text((x-offset, title_y-offset), title_text, 
                      fill=(100, 100, 100, 128), font=title_font)
-        draw.text((x, 600), title_text, fill=self.colors['text'], font=title_font)
+        draw.text((x, title_y), title_text, fill=self.colors['text'], font=title_font)
         
         # Subtitle
-        bbox = draw.textbbox((0, 0), subtitle_text, font=subtitle_font)
-        x = (self.video_width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, 750), subtitle_text, fill=self.colors['text'], font=subtitle_font)
+        paste_centered_text(img, L.y(750), subtitle_text, L.s(50), self.colors['text'])
         
         # Prompt text
-        bbox = draw.textbbox((0, 0), prompt_text, font=subtitle_font)
-        x = (self.video_width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, 850), prompt_text, fill=(200, 200, 200), font=subtitle_font)
+        paste_centered_text(img, L.y(850), prompt_text, L.s(50), (200, 200, 200))
         
         # Add emoji elements
-        draw.text((100, 1000), "🤖", font=ImageFont.truetype("Arial.ttf", 100))
-        draw.text((880, 1000), "💻", font=ImageFont.truetype("Arial.ttf", 100))
-        draw.text((490, 1000), "⚔️", font=ImageFont.truetype("Arial.ttf", 100))
+        paste_text(img, (L.x(100), L.y(1000)), "🤖", L.s(100))
+        paste_text(img, (L.x(880), L.y(1000)), "💻", L.s(100))
+        paste_text(img, (L.x(490), L.y(1000)), "⚔️", L.s(100))
         
         # Save and create video clip
-        intro_path = "temp_intro.png"
+        intro_path = self.workspace.path_for("intro.png")
         img.save(intro_path)
         
         return ImageClip(intro_path).set_duration(duration)
@@ -86,15 +88,12 @@ class VideoAutomator:
     def create_model_reveal(self, model_name: str, screenshot_path: str, duration: int = 3):
         """Create individual model reveal with animation"""
         
-        # Load and resize screenshot
-        screenshot = Image.open(screenshot_path)
-        
         # Calculate dimensions to fit in frame with padding
         target_width = int(self.video_width * 0.85)
         target_height = int(self.video_height * 0.5)
         
-        # Resize maintaining aspect ratio
-        screenshot.thumbnail((target_width, target_height), Image.Resampling.LANCZOS)
+        # Load and resize maintaining aspect ratio (shared decoded cache)
+        screenshot = load_fitted(screenshot_path, (target_width, target_height))
         
         # Create frame
         frame = Image.new('RGB', (self.video_width, self.video_height), self.colors['background'])
@@ -104,32 +103,34 @@ class VideoAutomator:
         y_offset = (self.video_height - screenshot.height) // 2
         
         # Add shadow/glow effect
+        L = self.layout
         shadow = Image.new('RGBA', screenshot.size, (0, 0, 0, 0))
         shadow.paste((0, 0, 0, 180), (0, 0, screenshot.width, screenshot.height))
-        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=10))
+        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=L.s(10)))
         
-        frame.paste(shadow, (x_offset + 10, y_offset + 10), shadow)
+        frame.paste(shadow, (x_offset + L.s(10), y_offset + L.s(10)), shadow)
         frame.paste(screenshot, (x_offset, y_offset))
         
         # Add model label
         draw = ImageDraw.Draw(frame)
-        label_font = ImageFont.truetype("Arial-Bold.ttf", 70)
         
         # Model name with brand color
         model_display = model_name.upper()
-        bbox = draw.textbbox((0, 0), model_display, font=label_font)
+        label_size = L.s(70)
+        bbox = text_bbox(model_display, label_size, 'bold')
         x = (self.video_width - (bbox[2] - bbox[0])) // 2
+        label_y = L.y(200)
         
         # Draw label background
-        padding = 20
+        padding = L.s(20)
         draw.rounded_rectangle(
-            [x - padding, 200 - padding, 
-             x + (bbox[2] - bbox[0]) + padding, 200 + (bbox[3] - bbox[1]) + padding],
-            radius=20,
+            [x - padding, label_y - padding, 
+             x + (bbox[2] - bbox[0]) + padding, label_y + (bbox[3] - bbox[1]) + padding],
+            radius=L.s(20),
             fill=self.colors.get(model_name, '#333333')
         )
         
-        draw.text((x, 200), model_display, fill=self.colors['text'], font=label_font)
+        paste_text(frame, (x, label_y), model_display, label_size, self.colors['text'], 'bold')
         
         # Add reaction text
         reactions = {
@@ -138,53 +139,39 @@ class VideoAutomator:
             'gemini': "Colorful energy 🎨"
         }
         
-        reaction_font = ImageFont.truetype("Arial.ttf", 50)
         reaction = reactions.get(model_name, "Unique style 🎯")
-        bbox = draw.textbbox((0, 0), reaction, font=reaction_font)
-        x = (self.video_width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, self.video_height - 300), reaction, 
-                 fill=(200, 200, 200), font=reaction_font)
+        paste_centered_text(frame, self.video_height - L.y(300), reaction, L.s(50),
+                            (200, 200, 200))
         
         # Save and create clip
-        reveal_path = f"temp_reveal_{model_name}.png"
+        reveal_path = self.workspace.path_for(f"reveal_{model_name}.png")
         frame.save(reveal_path)
         
-        # Create clip with zoom animation
-        clip = ImageClip(reveal_path).set_duration(duration)
+        # Zoom in 5% per second, rendered by FFmpeg's zoompan instead of
+        # resampling every frame in Python
+        zoom_path = self.workspace.path_for(f"reveal_{model_name}.mp4")
+        render_motion_clip(reveal_path, zoom_path,
+                           {'type': 'ken_burns', 'zoom_end': 1 + 0.05 * duration},
+                           duration, self.fps, self.video_width, self.video_height)
         
-        # Add zoom in effect
-        clip = clip.resize(lambda t: 1 + 0.05 * t)
-        
-        return clip
+        return VideoFileClip(zoom_path)
     
     def create_comparison_grid(self, screenshots: Dict[str, str], duration: int = 5):
         """Create side-by-side comparison"""
         
         # Create base frame
         frame = Image.new('RGB', (self.video_width, self.video_height), self.colors['background'])
-        draw = ImageDraw.Draw(frame)
+        L = self.layout
         
         # Add title
-        title_font = ImageFont.truetype("Arial-Bold.ttf", 60)
-        title = "SPOT THE DIFFERENCES"
-        bbox = draw.textbbox((0, 0), title, font=title_font)
-        x = (self.video_width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, 100), title, fill=self.colors['text'], font=title_font)
-        
-        # Calculate grid layout
-        num_models = len(screenshots)
-        if num_models <= 2:
-            cols = 1
-            rows = 2
-        elif num_models <= 4:
-            cols = 2
-            rows = 2
-        else:
-            cols = 2
-            rows = 3
+        paste_centered_text(frame, L.y(100), "SPOT THE DIFFERENCES", L.s(60), self.colors['text'],
+                            'bold')
+        
+        # Calculate grid layout (columns and rows swap on landscape frames)
+        cols, rows = L.grid_shape(len(screenshots))
         
         cell_width = self.video_width // cols
-        cell_height = (self.video_height - 300) // rows  # Leave space for title and footer
+        cell_height = (self.video_height - L.y(300)) // rows  # Leave space for title and footer
         
         # Place screenshots in grid
         for idx, (model_name, screenshot_path) in enumerate(screenshots.items()):
@@ -192,38 +179,32 @@ class VideoAutomator:
             col = idx % cols
             
             # Load and resize screenshot
-            img = Image.open(screenshot_path)
-            img.thumbnail((int(cell_width * 0.9), int(cell_height * 0.8)), 
-                         Image.Resampling.LANCZOS)
+            img = load_fitted(screenshot_path, (int(cell_width * 0.9), int(cell_height * 0.8)))
             
             # Calculate position
             x = col * cell_width + (cell_width - img.width) // 2
-            y = 250 + row * cell_height + (cell_height - img.height) // 2
+            y = L.y(250) + row * cell_height + (cell_height - img.height) // 2
             
             # Add border with model color
+            border = L.s(5)
             border_img = Image.new('RGB', 
-                                  (img.width + 10, img.height + 10), 
+                                  (img.width + 2 * border, img.height + 2 * border), 
                                   self.colors.get(model_name, '#333333'))
-            border_img.paste(img, (5, 5))
+            border_img.paste(img, (border, border))
             
             frame.paste(border_img, (x, y))
             
             # Add model label
-            label_font = ImageFont.truetype("Arial.ttf", 40)
-            draw.text((x + 10, y - 40), model_name.upper(), 
-                     fill=self.colors.get(model_name, '#FFFFFF'), 
-                     font=label_font)
+            paste_text(frame, (x + L.s(10), y - L.s(40)), model_name.upper(), L.s(40),
+                       self.colors.get(model_name, '#FFFFFF'))
         
         # Add call to action
-        cta_font = ImageFont.truetype("Arial-Bold.ttf", 50)
         cta = "Which is YOUR favorite? 👇"
-        bbox = draw.textbbox((0, 0), cta, font=cta_font)
-        x = (self.video_width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, self.video_height - 150), cta, 
-                 fill=self.colors['text'], font=cta_font)
+        paste_centered_text(frame, self.video_height - L.y(150), cta, L.s(50), self.colors['text'],
+                            'bold')
         
         # Save and create clip
-        grid_path = "temp_grid.png"
+        grid_path = self.workspace.path_for("grid.png")
         frame.save(grid_path)
         
         return ImageClip(grid_path).set_duration(duration)
@@ -240,94 +221,104 @@ class VideoAutomator:
         return video_clip
     
     def create_comparison_video(self, screenshots: Dict[str, str], 
-                              prompt_title: str, output_path: str):
-        """Assemble the complete video"""
+                              prompt_title: str, output_path: str, outputs=None, fit='pad'):
+        """Assemble the complete video
         
-        clips = []
+        outputs (e.g. ['1:1', '16:9']) re-frames the finished video into
+        every listed size with one FFmpeg split pass; returns {label: path}.
+        """
         
-        # 1. Intro (2 seconds)
-        intro_clip = self.create_intro_slide(prompt_title, duration=2)
-        clips.append(intro_clip)
+        clips = []
+        sources = []
+        final_video = None
         
-        # 2. Individual reveals (2.5 seconds each)
-        for model_name, screenshot_path in screenshots.items():
-            reveal_clip = self.create_model_reveal(model_name, screenshot_path, duration=2.5)
+        try:
+            # 1. Intro (2 seconds)
+            intro_clip = self.create_intro_slide(prompt_title, duration=2)
+            clips.append(intro_clip)
             
-            # Add transition
-            if clips:
-                reveal_clip = reveal_clip.crossfadein(0.3)
-            clips.append(reveal_clip)
-        
-        # 3. Comparison grid (5 seconds)
-        grid_clip = self.create_comparison_grid(screenshots, duration=5)
-        grid_clip = grid_clip.crossfadein(0.3)
-        clips.append(grid_clip)
-        
-        # 4. Outro (2 seconds)
-        outro_clip = self.create_outro_slide(duration=2)
-        outro_clip = outro_clip.crossfadein(0.3)
-        clips.append(outro_clip)
-        
-        # Concatenate all clips
-        final_video = concatenate_videoclips(clips)
-        
-        # Add background music
-        final_video = self.add_background_music(final_video)
-        
-        # Export with optimal settings for social media
-        final_video.write_videofile(
-            output_path,
-            codec='libx264',
-            fps=self.fps,
-            preset='fast',
-            audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True
-        )
-        
-        # Clean up temp files
-        for temp_file in os.listdir('.'):
-            if temp_file.startswith('temp_'):
-                os.remove(temp_file)
+            # 2. Individual reveals (2.5 seconds each)
+            for model_name, screenshot_path in screenshots.items():
+                reveal_clip = self.create_model_reveal(model_name, screenshot_path, duration=2.5)
+                sources.append(reveal_clip)
+                
+                # Add transition
+                if clips:
+                    reveal_clip = reveal_clip.crossfadein(0.3)
+                clips.append(reveal_clip)
+            
+            # 3. Comparison grid (5 seconds)
+            grid_clip = self.create_comparison_grid(screenshots, duration=5)
+            grid_clip = grid_clip.crossfadein(0.3)
+            clips.append(grid_clip)
+            
+            # 4. Outro (2 seconds)
+            outro_clip = self.create_outro_slide(duration=2)
+            outro_clip = outro_clip.crossfadein(0.3)
+            clips.append(outro_clip)
+            
+            # Concatenate all clips
+            final_video = concatenate_videoclips(clips)
+            
+            # Add background music
+            final_video = self.add_background_music(final_video)
+            
+            # Export with optimal settings for social media
+            final_video.write_videofile(
+                output_path,
+                codec='libx264',
+                fps=self.fps,
+                preset='fast',
+                audio_codec='aac',
+                temp_audiofile=self.workspace.path_for('audio.m4a'),
+                remove_temp=True
+            )
+        finally:
+            # Reveal clips keep an FFmpeg reader open on their mp4s
+            for clip in [final_video, *sources]:
+                if clip is not None:
+                    clip.close()
+        
+        # Clean up this video's intermediates (only our own workspace)
+        self.workspace.clear()
+        
+        if outputs:
+            return reframe_video(output_path, outputs, fit=fit,
+                                 background=self.colors['background'])
         
         return output_path
     
+    def close(self):
+        """Delete the scratch workspace"""
+        self.workspace.close()
+    
     def create_outro_slide(self, duration: int = 2):
         """Create engaging outro with call to action"""
         
-        img = Image.new('RGB', (self.video_width, self.video_height), self.colors['background'])
-        draw = ImageDraw.Draw(img)
+        # Gradient base image
+        img = gradient_background((self.video_width, self.video_height), 'linear',
+                                  (15, 15, 15), (40, 40, 40))
         
-        # Add gradient
-        for i in range(self.video_height):
-            color_value = int(15 + (25 * (i / self.video_height)))
-            draw.rectangle([0, i, self.video_width, i+1], 
-                          fill=(color_value, color_value, color_value))
+        L = self.layout
         
-        # Add text
-        font_large = ImageFont.truetype("Arial-Bold.ttf", 70)
-        font_medium = ImageFont.truetype("Arial.ttf", 50)
+        # Add text (size, family)
+        large = (L.s(70), 'bold')
+        medium = (L.s(50), 'regular')
         
         texts = [
-            ("FOLLOW FOR MORE", font_large, self.colors['text'], 700),
-            ("AI BATTLES", font_large, self.colors['text'], 800),
-            ("Drop your favorite in comments!", font_medium, (200, 200, 200), 1000),
-            ("Which AI is your spirit animal?", font_medium, (200, 200, 200), 1100)
+            ("FOLLOW FOR MORE", large, self.colors['text'], L.y(700)),
+            ("AI BATTLES", large, self.colors['text'], L.y(800)),
+            ("Drop your favorite in comments!", medium, (200, 200, 200), L.y(1000)),
+            ("Which AI is your spirit animal?", medium, (200, 200, 200), L.y(1100))
         ]
         
-        for text, font, color, y_pos in texts:
-            bbox = draw.textbbox((0, 0), text, font=font)
-            x = (self.video_width - (bbox[2] - bbox[0])) // 2
-            draw.text((x, y_pos), text, fill=color, font=font)
+        for text, (size, family), color, y_pos in texts:
+            paste_centered_text(img, y_pos, text, size, color, family)
         
         # Add emojis
-        emoji_font = ImageFont.truetype("Arial.ttf", 80)
-        emojis = "🤖 💭 🎨 💻 ⚡"
-        bbox = draw.textbbox((0, 0), emojis, font=emoji_font)
-        x = (self.video_width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, 1300), emojis, font=emoji_font)
+        paste_centered_text(img, L.y(1300), "🤖 💭 🎨 💻 ⚡", L.s(80))
         
-        outro_path = "temp_outro.png"
+        outro_path = self.workspace.path_for("outro.png")
         img.save(outro_path)
         
         return ImageClip(outro_path).set_duration(duration)
@@ -349,5 +340,6 @@ if __name__ == "__main__":
         prompt_title="Calculator App",
         output_path="output/calculator_comparison.mp4"
     )
+    automator.close()
     
     print(f"Video created: {output_path}")
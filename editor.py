@@ -2,8 +2,8 @@ from video_edit_helper import VideoEditHelper
 
 editor = VideoEditHelper("euler_visualization")
 
-# Extract frames from your generated video
-editor.extract_frames_from_video('output/euler_visualization_plot_twist_20250711_155858.mp4')
+# Extract one frame per slide (with its original timing) from your generated video
+editor.extract_frames_from_video('output/euler_visualization_plot_twist_20250711_155858.mp4', mode='scene')
 
 # See what you have
 editor.preview_frames(editor.get_current_frames())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+CPU-budgeted scheduler for concurrent FFmpeg encodes
+Every job gets an explicit encoder thread count, and running jobs never
+use more than the global core budget between them
+"""
+
+import os
+import time
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+
+
+class EncodeJob:
+    """One queued encode and its timing"""
+
+    def __init__(self, label, func, args, kwargs, threads, media_seconds):
+        self.label = label
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.threads = threads
+        self.media_seconds = media_seconds  # Length of the output video, if known
+
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.future = None
+
+    @property
+    def state(self):
+        if self.finished:
+            return 'failed' if self.error else 'done'
+        return 'running' if self.started else 'queued'
+
+    @property
+    def wait_time(self):
+        return (self.started or time.perf_counter()) - self.submitted
+
+    @property
+    def wall_time(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def speed(self):
+        """Seconds of video encoded per wall-clock second"""
+        if not self.media_seconds or not self.finished or not self.wall_time:
+            return None
+        return self.media_seconds / self.wall_time
+
+
+class EncodeScheduler:
+    """Queue encode jobs and hand each one threads under a shared core budget
+
+    Encode functions must accept a `threads` keyword, like
+    SimpleVideoCreator.create_video_from_images, ViralContentPipeline.create_video
+    and VideoEditHelper.rebuild_video.
+    """
+
+    def __init__(self, core_budget=None, threads_per_job=2):
+        self.core_budget = core_budget or os.cpu_count() or 1
+        self.threads_per_job = max(1, min(threads_per_job, self.core_budget))
+
+        self._cond = threading.Condition()
+        self._available = self.core_budget
+        self._jobs = []
+
+        # Every job holds at least one core, so this bounds concurrency too
+        self._executor = ThreadPoolExecutor(max_workers=self.core_budget,
+                                            thread_name_prefix='encode')
+
+    def submit(self, func, *args, label=None, threads=None, media_seconds=None, **kwargs):
+        """Queue `func(*args, threads=N, **kwargs)`; returns a Future"""
+        threads = max(1, min(threads or self.threads_per_job, self.core_budget))
+        if media_seconds is None:
+            media_seconds = self.media_seconds(func, args, kwargs)
+
+        job = EncodeJob(label or getattr(func, '__name__', 'encode'),
+                        func, args, kwargs, threads, media_seconds)
+        # Registered before it can start, so stats() and wait() never miss it
+        with self._cond:
+            self._jobs.append(job)
+            job.future = self._executor.submit(self._run, job)
+        return job.future
+
+    @staticmethod
+    def media_seconds(func, args, kwargs):
+        """Video length from the encode's `durations` argument, positional or keyword"""
+        try:
+            bound = inspect.signature(func).bind_partial(*args, **kwargs)
+        except (TypeError, ValueError):
+            return None
+        durations = bound.arguments.get('durations')
+        return sum(durations) if durations else None
+
+    def _run(self, job):
+        # Block until the budget has room for this job's threads
+        with self._cond:
+            while self._available < job.threads:
+                self._cond.wait()
+            self._available -= job.threads
+            job.started = time.perf_counter()
+
+        try:
+            return job.func(*job.args, threads=job.threads, **job.kwargs)
+        except Exception as e:
+            job.error = e
+            raise
+        finally:
+            job.finished = time.perf_counter()
+            with self._cond:
+                self._available += job.threads
+                self._cond.notify_all()
+
+    @property
+    def queue_depth(self):
+        """Jobs submitted but not yet started"""
+        with self._cond:
+            return sum(1 for job in self._jobs if job.started is None)
+
+    def stats(self):
+        """Queue depth, core usage and per-job timing"""
+        with self._cond:
+            jobs = list(self._jobs)
+            available = self._available
+
+        return {
+            'core_budget': self.core_budget,
+            'cores_in_use': self.core_budget - available,
+            'queued': sum(1 for job in jobs if job.started is None),
+            'running': sum(1 for job in jobs if job.started and not job.finished),
+            'completed': sum(1 for job in jobs if job.finished),
+            'jobs': [
+                {
+                    'label': job.label,
+                    'state': job.state,
+                    'threads': job.threads,
+                    'wait_s': round(job.wait_time, 3),
+                    'wall_s': round(job.wall_time, 3),
+                    'media_s': job.media_seconds,
+                    'speed': round(job.speed, 2) if job.speed else None,
+                    'error': str(job.error) if job.error else None
+                }
+                for job in jobs
+            ]
+        }
+
+    def report(self):
+        """Print queue state and per-job throughput"""
+        stats = self.stats()
+        print(f"\n⚙️ Encode scheduler: {stats['completed']} done, {stats['running']} running, "
+              f"{stats['queued']} queued ({stats['cores_in_use']}/{stats['core_budget']} cores)")
+        icons = {'done': '✅', 'failed': '❌', 'running': '▶️', 'queued': '⏳'}
+        for job in stats['jobs']:
+            speed = f", {job['speed']}x realtime" if job['speed'] else ""
+            print(f"  {icons[job['state']]} {job['label']}: {job['threads']} threads, "
+                  f"waited {job['wait_s']}s, ran {job['wall_s']}s{speed}")
+
+    def wait(self):
+        """Block until every job submitted so far has finished"""
+        with self._cond:
+            futures = [job.future for job in self._jobs]
+        wait_futures(futures)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
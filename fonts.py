@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Shared font resolution for all slide renderers
+Probes the font search path once and caches FreeTypeFont objects per (family, size)
+"""
+
+import os
+from functools import lru_cache
+from PIL import ImageFont
+
+# Drop a TTF in here to pin the look of every renderer
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+
+# (file, face index) candidates per family, best first
+FONT_CANDIDATES = {
+    'regular': [
+        (os.path.join(FONT_DIR, 'regular.ttf'), 0),
+        ("/System/Library/Fonts/Helvetica.ttc", 0),
+        ("Arial.ttf", 0),
+        ("arial.ttf", 0),
+        ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 0),
+        ("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", 0),
+        ("DejaVuSans.ttf", 0),
+    ],
+    'bold': [
+        (os.path.join(FONT_DIR, 'bold.ttf'), 0),
+        ("/System/Library/Fonts/Helvetica.ttc", 1),
+        ("Arial-Bold.ttf", 0),
+        ("arialbd.ttf", 0),
+        ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 0),
+        ("/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf", 0),
+        ("DejaVuSans-Bold.ttf", 0),
+    ],
+}
+
+
+@lru_cache(maxsize=None)
+def resolve_font(family='regular'):
+    """Find the first usable font file for a family (probed once per process)"""
+    for path, index in FONT_CANDIDATES.get(family, FONT_CANDIDATES['regular']):
+        # Bare names are looked up by FreeType in the system font dirs
+        if os.path.isabs(path) and not os.path.exists(path):
+            continue
+        try:
+            ImageFont.truetype(path, 10, index=index)
+            return path, index
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_font(size, family='regular'):
+    """Shared FreeTypeFont for (family, size)"""
+    resolved = resolve_font(family)
+    if resolved:
+        path, index = resolved
+        return ImageFont.truetype(path, size, index=index)
+
+    # Pillow ships its own TTF (Aileron) for hosts with no usable system font
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Perceptual hashing (dHash) of extracted frames, vectorized with NumPy
+Used to collapse runs of identical frames into a single slide
+"""
+
+import numpy as np
+from PIL import Image
+
+
+def dhash_bits(paths, hash_size=16):
+    """Difference-hash bits for every frame, as an (N, hash_size**2) bool array"""
+    if not paths:
+        return np.zeros((0, hash_size * hash_size), dtype=bool)
+
+    # Decode + shrink each frame once; everything after is one array operation
+    thumbs = np.stack([
+        np.asarray(
+            Image.open(path).convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BOX),
+            dtype=np.int16
+        )
+        for path in paths
+    ])
+    bits = thumbs[:, :, 1:] > thumbs[:, :, :-1]
+    return bits.reshape(len(paths), -1)
+
+
+def hashes_to_hex(bits):
+    """Hex string per frame hash"""
+    return [row.tobytes().hex() for row in np.packbits(bits, axis=1)]
+
+
+def consecutive_distances(bits):
+    """Hamming distance between each frame and the one before it"""
+    return np.count_nonzero(bits[1:] != bits[:-1], axis=1)
+
+
+def duplicate_runs(bits, max_distance=2):
+    """Group frame indices into runs of consecutive near-identical frames"""
+    if len(bits) == 0:
+        return []
+
+    # A new run starts wherever a frame differs from its predecessor
+    starts = np.flatnonzero(consecutive_distances(bits) > max_distance) + 1
+    bounds = [0, *starts.tolist(), len(bits)]
+    return [list(range(a, b)) for a, b in zip(bounds, bounds[1:])]
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Stream rendered frames straight into FFmpeg over a pipe
+Skips the PNG encode -> disk write -> PNG decode round trip entirely
+"""
+
+import math
+import subprocess
+from fractions import Fraction
+import numpy as np
+from PIL import Image
+
+
+def rgb_to_yuv420p(img):
+    """Convert an RGB image to planar yuv420p bytes (BT.601, limited range)"""
+    rgb = np.asarray(img, dtype=np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+    y = 16 + (65.481 * r + 128.553 * g + 24.966 * b) / 255
+    cb = 128 + (-37.797 * r - 74.203 * g + 112.0 * b) / 255
+    cr = 128 + (112.0 * r - 93.786 * g - 18.214 * b) / 255
+
+    # 2x2 average for chroma subsampling
+    h, w = y.shape
+    cb = cb.reshape(h // 2, 2, w // 2, 2).mean(axis=(1, 3))
+    cr = cr.reshape(h // 2, 2, w // 2, 2).mean(axis=(1, 3))
+
+    planes = [np.clip(np.rint(p), 0, 255).astype(np.uint8) for p in (y, cb, cr)]
+    return b''.join(p.tobytes() for p in planes)
+
+
+def still_frame_rate(durations, max_fps=30):
+    """Lowest integer frame rate at which every duration is a whole number of frames
+
+    For slideshows of static slides: 2s and 2.5s slides need only 2 fps.
+    Falls back to max_fps when no lower rate fits.
+    """
+    rate = 1
+    for duration in durations:
+        rate = math.lcm(rate, Fraction(duration).limit_denominator(max_fps).denominator)
+        if rate > max_fps:
+            return max_fps
+
+    if all(abs(d * rate - round(d * rate)) < 1e-6 for d in durations):
+        return rate
+    return max_fps
+
+
+class FramePipeWriter:
+    """Feed raw frames into an `ffmpeg -f rawvideo -i pipe:0` encoder"""
+
+    def __init__(self, output_path, width=1080, height=1920, fps=30,
+                 pix_fmt='yuv420p', preset='fast', crf=23, threads=None, tune=None):
+        if pix_fmt not in ('rgb24', 'yuv420p'):
+            raise ValueError(f"Unsupported pix_fmt: {pix_fmt}")
+
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.pix_fmt = pix_fmt
+        self.preset = preset
+        self.crf = crf
+        self.threads = threads  # Encoder threads (None = FFmpeg default)
+        self.tune = tune  # x264 tuning, e.g. 'stillimage'
+
+        self.process = None
+        self.elapsed = 0.0
+        self.frames_written = 0
+
+    def input_args(self):
+        """Raw frames of this writer's size/format/rate on stdin"""
+        return [
+            '-f', 'rawvideo',
+            '-pix_fmt', self.pix_fmt,
+            '-s', f'{self.width}x{self.height}',
+            '-r', str(self.fps),
+            '-i', 'pipe:0'
+        ]
+
+    def encode_args(self):
+        """x264 settings for one output file"""
+        thread_args = ['-threads', str(self.threads)] if self.threads else []
+        tune_args = ['-tune', self.tune] if self.tune else []
+        return [
+            '-pix_fmt', 'yuv420p',
+            '-c:v', 'libx264',
+            '-preset', self.preset,
+            '-crf', str(self.crf),
+            *tune_args,
+            *thread_args
+        ]
+
+    def build_command(self):
+        """FFmpeg command reading raw frames from stdin"""
+        return [
+            'ffmpeg', '-y',
+            '-loglevel', 'error',
+            *self.input_args(),
+            *self.encode_args(),
+            self.output_path
+        ]
+
+    def open(self):
+        """Start the FFmpeg encoder process"""
+        self.process = subprocess.Popen(
+            self.build_command(),
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        return self
+
+    def frame_bytes(self, frame):
+        """Raw bytes for one frame (accepts a PIL image or an image path)"""
+        if isinstance(frame, str):
+            frame = Image.open(frame)
+
+        if frame.mode != 'RGB':
+            frame = frame.convert('RGB')
+        if frame.size != (self.width, self.height):
+            frame = frame.resize((self.width, self.height), Image.Resampling.LANCZOS)
+
+        if self.pix_fmt == 'yuv420p':
+            return rgb_to_yuv420p(frame)
+        return frame.tobytes()
+
+    def write_frame(self, frame, duration):
+        """Hold a frame on screen for `duration` seconds"""
+        if self.process is None:
+            self.open()
+
+        # Track the timeline so rounding errors don't accumulate
+        start = round(self.elapsed * self.fps)
+        self.elapsed += duration
+        count = round(self.elapsed * self.fps) - start
+
+        data = self.frame_bytes(frame)
+        try:
+            for _ in range(count):
+                self.process.stdin.write(data)
+        except BrokenPipeError:
+            self.close()
+            raise
+
+        self.frames_written += count
+
+    def close(self):
+        """Flush stdin and wait for FFmpeg to finish the file"""
+        if self.process is None:
+            return
+
+        process, self.process = self.process, None
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = process.stderr.read()
+        process.wait()
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, self.build_command(), stderr=stderr
+            )
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self.process is not None:
+            # Don't leave a half-written encoder running
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        return False
+
+
+def slideshow_rate_args(fps, still=False):
+    """Output args for a concat-demuxer slideshow
+
+    CFR resamples every slide to `fps`; still=True keeps the demuxer's
+    timestamps (VFR, one frame per slide) and tunes x264 for still images.
+    B-frames are off in that mode: with multi-second gaps between frames their
+    reorder delay throws off the MP4 duration.
+    """
+    if still:
+        return ['-vf', 'format=yuv420p', '-fps_mode', 'vfr', '-tune', 'stillimage', '-bf', '0']
+    return ['-vf', f'fps={fps},format=yuv420p']
+
+
+def pipe_frames_to_video(frames, durations, output_path, width=1080, height=1920,
+                         fps=30, pix_fmt='yuv420p', threads=None, still=False):
+    """Encode a slideshow from in-memory frames in a single FFmpeg process
+
+    still=True drops to the lowest frame rate that keeps slide timing exact
+    and tunes x264 for still images (only for slideshows without motion).
+    """
+    tune = None
+    if still:
+        fps, tune = still_frame_rate(durations, fps), 'stillimage'
+
+    with FramePipeWriter(output_path, width, height, fps, pix_fmt, threads=threads,
+                         tune=tune) as writer:
+        for frame, duration in zip(frames, durations):
+            writer.write_frame(frame, duration)
+    return output_path
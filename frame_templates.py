@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Pre-rendered static frame layers
+A template is a background plus a tuple of drawing ops (label pills, borders,
+taglines, footers). It is rendered once per distinct (size, background, ops)
+and every frame starts from a copy of it, so only dynamic content is drawn
+"""
+
+from functools import lru_cache
+from PIL import Image, ImageDraw
+from text_sprites import paste_text, paste_centered_text, line_width
+
+
+# Drawing ops. Each is a plain tuple so a whole template is hashable and the
+# cache key covers everything that affects the pixels (model, kind, resolution)
+
+def pill(label, size, top, bottom, text_y, color, padding=30, radius=20, fill='#FFFFFF'):
+    """Horizontally centered label on a rounded, colored background"""
+    return ('pill', label, size, top, bottom, text_y, color, padding, radius, fill)
+
+
+def centered_text(y, label, size, fill='#FFFFFF', family='regular', shadow=None):
+    return ('centered_text', y, label, size, fill, family, shadow)
+
+
+def placed_text(xy, label, size, fill='#FFFFFF', family='regular', shadow=None):
+    return ('placed_text', tuple(xy), label, size, fill, family, shadow)
+
+
+def rectangle(box, fill=None, outline=None, width=1):
+    return ('rectangle', tuple(box), fill, outline, width)
+
+
+def default_font_text(xy, label, fill, anchor=None):
+    """Text in PIL's built-in bitmap font (used for small placeholders)"""
+    return ('default_font_text', tuple(xy), label, fill, anchor)
+
+
+def _draw_op(img, draw, op):
+    kind, *args = op
+    if kind == 'pill':
+        label, size, top, bottom, text_y, color, padding, radius, fill = args
+        width = line_width(label, size)
+        x = (img.width - width) // 2
+        draw.rounded_rectangle([x - padding, top, x + width + padding, bottom],
+                               radius=radius, fill=color)
+        paste_text(img, (x, text_y), label, size, fill)
+    elif kind == 'centered_text':
+        y, label, size, fill, family, shadow = args
+        paste_centered_text(img, y, label, size, fill, family, shadow)
+    elif kind == 'placed_text':
+        xy, label, size, fill, family, shadow = args
+        paste_text(img, xy, label, size, fill, family, shadow)
+    elif kind == 'rectangle':
+        box, fill, outline, width = args
+        draw.rectangle(box, fill=fill, outline=outline, width=width)
+    elif kind == 'default_font_text':
+        xy, label, fill, anchor = args
+        draw.text(xy, label, fill=fill, anchor=anchor)
+    else:
+        raise ValueError(f"Unknown template op: {kind}")
+
+
+@lru_cache(maxsize=32)
+def _render_template(size, background, ops):
+    img = Image.new('RGB', size, background)
+    draw = ImageDraw.Draw(img)
+    for op in ops:
+        _draw_op(img, draw, op)
+    return img
+
+
+def template_frame(size, background, ops):
+    """Fresh frame with the static layers already drawn (safe to draw on)"""
+    return _render_template(tuple(size), background, tuple(ops)).copy()
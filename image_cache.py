@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+In-memory cache of decoded, resized screenshots
+The same screenshot is fitted into the same box by several frame builders and
+again for every storyline; each distinct fit is decoded and resampled once
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from PIL import Image
+
+
+class FittedImageCache:
+    """Thumbnailed images keyed by (path, mtime, size, box, resample), LRU by bytes"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def image_bytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    def key_for(self, path, box, resample):
+        # mtime + size catch a screenshot being re-captured in place
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size, tuple(box), int(resample))
+
+    def load(self, path, box, resample=Image.Resampling.LANCZOS):
+        """`path` decoded and fitted inside `box` like Image.thumbnail does
+
+        The returned image is shared between callers: paste it, don't draw on it.
+        """
+        key = self.key_for(path, box, resample)
+        with self._lock:
+            img = self._images.get(key)
+            if img is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return img
+
+        # thumbnail() picks a JPEG draft scale and reduce()s by integer factors
+        # before the final resample, so big captures never decode at full cost
+        with Image.open(path) as src:
+            src.thumbnail(tuple(box), resample, reducing_gap=2.0)
+            img = src.copy()
+
+        with self._lock:
+            self.misses += 1
+            if key not in self._images:
+                self._images[key] = img
+                self._bytes += self.image_bytes(img)
+                self._evict()
+        return img
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._images) > 1:
+            _, old = self._images.popitem(last=False)
+            self._bytes -= self.image_bytes(old)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    @property
+    def size(self):
+        return self._bytes
+
+
+# One cache per process (render pool workers each get their own)
+fitted_images = FittedImageCache()
+
+
+def load_fitted(path, box, resample=Image.Resampling.LANCZOS):
+    """Cached `Image.open(path)` + `thumbnail(box, resample)`"""
+    return fitted_images.load(path, box, resample)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Resolution-independent frame layouts
+Frame builders are designed on the 1080x1920 (9:16) canvas; a Layout maps
+those coordinates onto any output size. Rendering with size='1:1' or '16:9'
+composes every frame natively for that canvas. The outputs= option does not:
+it renders the 9:16 master once and letterboxes, crops or blur-fills it into
+each extra size (see multi_output)
+"""
+
+BASE_SIZE = (1080, 1920)
+
+# Named sizes for the formats we publish
+ASPECT_SIZES = {
+    '9:16': (1080, 1920),
+    '4:5': (1080, 1350),
+    '1:1': (1080, 1080),
+    '16:9': (1920, 1080)
+}
+
+
+def parse_size(size):
+    """(width, height) from a tuple, an aspect name ('1:1') or 'WIDTHxHEIGHT'"""
+    if isinstance(size, str):
+        if size in ASPECT_SIZES:
+            return ASPECT_SIZES[size]
+        try:
+            width, height = (int(v) for v in size.lower().split('x'))
+        except ValueError:
+            raise ValueError(f"Unknown size: {size} (use e.g. '1:1' or '1280x720')") from None
+    else:
+        width, height = (int(v) for v in size)
+
+    # yuv420p subsamples chroma 2x2
+    if width % 2 or height % 2:
+        raise ValueError(f"Video dimensions must be even, got {width}x{height}")
+    return width, height
+
+
+def size_label(size):
+    """Filename-safe label: '9x16' for named aspects, else '1280x720'"""
+    dims = parse_size(size)
+    for name, named_dims in ASPECT_SIZES.items():
+        if named_dims == dims:
+            return name.replace(':', 'x')
+    return f"{dims[0]}x{dims[1]}"
+
+
+class Layout:
+    """Maps coordinates designed for the 1080x1920 base canvas onto any size
+
+    x()/y() scale positions along each axis; s() scales sizes (fonts, padding,
+    borders) by the tighter axis so content designed for 9:16 still fits.
+    On the base canvas every mapping is the identity.
+    """
+
+    def __init__(self, size='9:16', base=BASE_SIZE):
+        self.width, self.height = parse_size(size)
+        self.sx = self.width / base[0]
+        self.sy = self.height / base[1]
+        self.unit = min(self.sx, self.sy)
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    @property
+    def landscape(self):
+        return self.width > self.height
+
+    def x(self, value):
+        return round(value * self.sx)
+
+    def y(self, value):
+        return round(value * self.sy)
+
+    def s(self, value):
+        return max(1, round(value * self.unit))
+
+    def grid_shape(self, count):
+        """(cols, rows) for a grid of `count` cells, wider than tall on landscape frames"""
+        if count <= 2:
+            cols, rows = 1, 2
+        elif count <= 4:
+            cols, rows = 2, 2
+        else:
+            cols, rows = 2, 3
+        return (rows, cols) if self.landscape else (cols, rows)
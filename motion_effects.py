@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Motion effects rendered by FFmpeg filter graphs (zoompan/scale/crop/overlay)
+Animated slides are encoded by FFmpeg directly instead of resampling every
+frame in Python
+"""
+
+import os
+import subprocess
+from PIL import Image
+from frame_pipe import FramePipeWriter
+from segment_cache import concat_segments
+
+
+def ken_burns_filter(duration, fps, width, height, zoom_start=1.0, zoom_end=1.05,
+                     focus=(0.5, 0.5), supersample=2):
+    """Slow zoom towards `focus` (fractions of width/height)
+
+    The still is upscaled first so zoompan's whole-pixel crop steps don't
+    show up as jitter in the output.
+    """
+    frames = max(1, round(duration * fps))
+    fx, fy = focus
+    zoom = f"{zoom_start}+({zoom_end}-{zoom_start})*on/{max(frames - 1, 1)}"
+    graph = (
+        f"scale={width * supersample}:{height * supersample},"
+        f"zoompan=z='{zoom}':x='(iw-iw/zoom)*{fx}':y='(ih-ih/zoom)*{fy}'"
+        f":d={frames}:s={width}x{height}:fps={fps}"
+    )
+    # zoompan emits all `d` frames from the single input image
+    return [], graph
+
+
+def pan_filter(duration, fps, width, height, direction='left', distance=0.1):
+    """Drift across a slightly enlarged still in one direction"""
+    big_w = int(width * (1 + distance)) // 2 * 2
+    big_h = int(height * (1 + distance)) // 2 * 2
+    progress = f"min(t/{duration},1)"
+
+    x, y = '(iw-ow)/2', '(ih-oh)/2'
+    if direction == 'left':
+        x = f"(iw-ow)*(1-{progress})"
+    elif direction == 'right':
+        x = f"(iw-ow)*{progress}"
+    elif direction == 'up':
+        y = f"(ih-oh)*(1-{progress})"
+    elif direction == 'down':
+        y = f"(ih-oh)*{progress}"
+    else:
+        raise ValueError(f"Unknown pan direction: {direction}")
+
+    graph = f"scale={big_w}:{big_h},crop={width}:{height}:x='{x}':y='{y}'"
+    return ['-loop', '1', '-framerate', str(fps), '-t', str(duration)], graph
+
+
+def slide_in_filter(duration, fps, width, height, direction='left', slide_time=0.5,
+                    background='#0F0F0F'):
+    """Slide the still in from an edge over `slide_time` seconds (ease-out)"""
+    remaining = f"pow(1-min(t/{slide_time},1),2)"
+    offsets = {
+        'left': (f"-W*{remaining}", '0'),
+        'right': (f"W*{remaining}", '0'),
+        'up': ('0', f"-H*{remaining}"),
+        'down': ('0', f"H*{remaining}")
+    }
+    if direction not in offsets:
+        raise ValueError(f"Unknown slide direction: {direction}")
+    x, y = offsets[direction]
+
+    color = background.lstrip('#')
+    graph = (
+        f"color=c=0x{color}:s={width}x{height}:r={fps}:d={duration}[bg];"
+        f"[0:v]scale={width}:{height}[fg];"
+        f"[bg][fg]overlay=x='{x}':y='{y}':eval=frame:shortest=1"
+    )
+    return ['-loop', '1', '-framerate', str(fps), '-t', str(duration)], graph
+
+
+EFFECTS = {
+    'ken_burns': ken_burns_filter,
+    'pan': pan_filter,
+    'slide_in': slide_in_filter
+}
+
+# Effects that show a background colour around the still
+BACKGROUND_EFFECTS = ('slide_in',)
+
+
+def build_motion_command(image_path, output_path, effect, duration, fps=30,
+                         width=1080, height=1920, preset='fast', crf=23, threads=None):
+    """FFmpeg command animating one still; `effect` is {'type': ..., **options}"""
+    options = dict(effect)
+    kind = options.pop('type')
+    if kind not in EFFECTS:
+        raise ValueError(f"Unknown motion effect: {kind}")
+
+    input_args, graph = EFFECTS[kind](duration, fps, width, height, **options)
+    thread_args = ['-threads', str(threads)] if threads else []
+    return [
+        'ffmpeg', '-y',
+        '-loglevel', 'error',
+        *input_args,
+        '-i', image_path,
+        '-filter_complex', graph,
+        '-frames:v', str(max(1, round(duration * fps))),
+        '-r', str(fps),
+        '-pix_fmt', 'yuv420p',
+        '-c:v', 'libx264',
+        '-preset', preset,
+        '-crf', str(crf),
+        *thread_args,
+        output_path
+    ]
+
+
+def render_motion_clip(frame, output_path, effect, duration, fps=30, width=1080,
+                       height=1920, preset='fast', crf=23, threads=None):
+    """Encode an animated clip of one still (PIL image or image path)"""
+    src_path = frame
+    if isinstance(frame, Image.Image):
+        src_path = f"{output_path}.src.png"
+        frame.save(src_path)
+
+    cmd = build_motion_command(src_path, output_path, effect, duration, fps,
+                               width, height, preset, crf, threads)
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    finally:
+        if src_path is not frame:
+            os.remove(src_path)
+    return output_path
+
+
+def render_slideshow_with_motion(frames, durations, effects, output_path, list_path,
+                                 fps=30, width=1080, height=1920, preset='fast', crf=23,
+                                 threads=None, segment_dir=None, background=None):
+    """Slideshow where each slide is still (effect None) or animated
+
+    Every slide is encoded as its own segment with identical encoder settings
+    and the segments are joined with a single `-c copy` pass. Segments go to
+    segment_dir (default: next to the output). effects needs one entry per
+    frame (None for a still slide). background, if given, is the
+    colour behind slide_in stills unless an effect sets its own.
+    """
+    # zip() would silently drop the slides past the shorter list
+    if not len(frames) == len(durations) == len(effects):
+        raise ValueError(f"Need one duration and one effect (or None) per frame, got "
+                         f"{len(frames)} frames, {len(durations)} durations, "
+                         f"{len(effects)} effects")
+
+    segment_dir = segment_dir or os.path.splitext(output_path)[0] + "_segments"
+    os.makedirs(segment_dir, exist_ok=True)
+
+    segments = []
+    try:
+        for i, (frame, duration, effect) in enumerate(zip(frames, durations, effects)):
+            segment = os.path.join(segment_dir, f"slide_{i:03d}.mp4")
+            if effect:
+                if background and effect['type'] in BACKGROUND_EFFECTS:
+                    effect = {'background': background, **effect}
+                render_motion_clip(frame, segment, effect, duration, fps, width, height,
+                                   preset, crf, threads)
+            else:
+                writer = FramePipeWriter(segment, width, height, fps,
+                                         preset=preset, crf=crf, threads=threads)
+                with writer:
+                    writer.write_frame(frame, duration)
+            segments.append(segment)
+
+        return concat_segments(segments, output_path, list_path)
+    finally:
+        for segment in segments:
+            if os.path.exists(segment):
+                os.remove(segment)
+        if os.path.isdir(segment_dir) and not os.listdir(segment_dir):
+            os.rmdir(segment_dir)
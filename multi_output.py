@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Several aspect ratios and sizes from one FFmpeg process
+The slideshow is rendered and decoded once; a `split` filter fans the stream
+out to one scale/pad (or crop, or blurred fill) branch per requested output.
+Every output shows the same frames fitted into its size; for a cut whose
+frames are composed for its own canvas, render with size= instead (see layouts)
+"""
+
+import os
+import subprocess
+from frame_pipe import FramePipeWriter, still_frame_rate
+from layouts import parse_size, size_label
+
+# How a frame is fitted into an output of a different aspect ratio
+FIT_MODES = ('pad', 'crop', 'blur')
+
+
+def unique_sizes(sizes):
+    """(width, height) for every size, in order, without repeats ('1:1' == '1080x1080')"""
+    unique = []
+    for size in sizes:
+        dims = parse_size(size)
+        if dims not in unique:
+            unique.append(dims)
+    return unique
+
+
+def output_paths(output_path, sizes):
+    """{label: path} with the size label appended, e.g. video_1x1.mp4"""
+    root, ext = os.path.splitext(output_path)
+    return {size_label(size): f"{root}_{size_label(size)}{ext}" for size in unique_sizes(sizes)}
+
+
+def reframe_filter(source, target, size, fit='pad', background='#0F0F0F'):
+    """Filter chain fitting stream [source] into `size`, labelled [target]"""
+    width, height = parse_size(size)
+    cover = f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height}"
+    contain = (f"scale={width}:{height}:force_original_aspect_ratio=decrease"
+               f":force_divisible_by=2")
+
+    if fit == 'crop':
+        return f"[{source}]{cover},setsar=1[{target}]"
+    if fit == 'pad':
+        color = background.lstrip('#')
+        return (f"[{source}]{contain},pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+                f":color=0x{color},setsar=1[{target}]")
+    if fit == 'blur':
+        # The frame itself, blurred and cropped to cover, fills the bars
+        return (f"[{source}]split[{target}_b][{target}_f];"
+                f"[{target}_b]{cover},boxblur=20:2[{target}_bg];"
+                f"[{target}_f]{contain}[{target}_fg];"
+                f"[{target}_bg][{target}_fg]overlay=(W-w)/2:(H-h)/2,setsar=1[{target}]")
+    raise ValueError(f"Unknown fit mode: {fit} (use one of {', '.join(FIT_MODES)})")
+
+
+def build_split_graph(sizes, fit='pad', background='#0F0F0F', source='0:v'):
+    """filter_complex splitting [source] into outputs labelled [o0], [o1], ..."""
+    branches = ''.join(f"[m{i}]" for i in range(len(sizes)))
+    filters = [f"[{source}]split={len(sizes)}{branches}"]
+    for i, size in enumerate(sizes):
+        filters.append(reframe_filter(f"m{i}", f"o{i}", size, fit, background))
+    return ';'.join(filters)
+
+
+class MultiOutputPipeWriter(FramePipeWriter):
+    """FramePipeWriter encoding every frame into several sizes at once
+
+    `outputs` maps output path -> size (tuple, '1:1' or 'WxH').
+    """
+
+    def __init__(self, outputs, width=1080, height=1920, fps=30, pix_fmt='yuv420p',
+                 preset='fast', crf=23, threads=None, tune=None, fit='pad',
+                 background='#0F0F0F'):
+        if not outputs:
+            raise ValueError("MultiOutputPipeWriter needs at least one output")
+        super().__init__(next(iter(outputs)), width, height, fps, pix_fmt,
+                         preset, crf, threads, tune)
+        self.outputs = {path: parse_size(size) for path, size in outputs.items()}
+        self.fit = fit
+        self.background = background
+
+    def build_command(self):
+        graph = build_split_graph(list(self.outputs.values()), self.fit, self.background)
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error', *self.input_args(),
+               '-filter_complex', graph]
+        for i, path in enumerate(self.outputs):
+            cmd += ['-map', f'[o{i}]', *self.encode_args(), path]
+        return cmd
+
+
+def pipe_frames_to_outputs(frames, durations, output_path, sizes, width=1080, height=1920,
+                           fps=30, pix_fmt='yuv420p', threads=None, still=False, fit='pad',
+                           background='#0F0F0F'):
+    """Encode one slideshow into every size in `sizes`; returns {label: path}"""
+    tune = None
+    if still:
+        fps, tune = still_frame_rate(durations, fps), 'stillimage'
+
+    sizes = unique_sizes(sizes)
+    paths = output_paths(output_path, sizes)
+    outputs = dict(zip(paths.values(), sizes))
+    writer = MultiOutputPipeWriter(outputs, width, height, fps, pix_fmt, threads=threads,
+                                   tune=tune, fit=fit, background=background)
+    with writer:
+        for frame, duration in zip(frames, durations):
+            writer.write_frame(frame, duration)
+    return paths
+
+
+def reframe_video(input_path, sizes, output_path=None, fit='pad', background='#0F0F0F',
+                  preset='fast', crf=23, threads=None):
+    """Re-encode a finished video into every size in one pass; returns {label: path}
+
+    Sizes naming the same dimensions ('1:1', '1080x1080') produce one output.
+    Audio, if any, is stream-copied into each output.
+    """
+    sizes = unique_sizes(sizes)
+    paths = output_paths(output_path or input_path, sizes)
+    thread_args = ['-threads', str(threads)] if threads else []
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-i', input_path,
+           '-filter_complex', build_split_graph(sizes, fit, background)]
+    for i, path in enumerate(paths.values()):
+        cmd += ['-map', f'[o{i}]', '-map', '0:a?',
+                '-pix_fmt', 'yuv420p', '-c:v', 'libx264', '-preset', preset,
+                '-crf', str(crf), *thread_args, '-c:a', 'copy', path]
+    subprocess.run(cmd, check=True, capture_output=True)
+    return paths
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Screenshot cache keyed on HTML content, local assets, viewport and wait settings
+Unchanged inputs skip the browser entirely
+"""
+
+import os
+import re
+import json
+import hashlib
+from disk_cache import DiskLRUCache, hash_file
+
+# src="...", href="..." and CSS url(...) references
+ASSET_REF = re.compile(r'''(?:\b(?:src|href)\s*=\s*["']|url\(\s*["']?)([^"')\s]+)''', re.IGNORECASE)
+
+
+def local_assets(html_file, content):
+    """Relative asset paths referenced by an HTML page that exist on disk"""
+    base_dir = os.path.dirname(os.path.abspath(html_file))
+    assets = set()
+
+    for ref in ASSET_REF.findall(content):
+        # Remote, inline and in-page references don't live next to the HTML
+        if re.match(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', ref, re.IGNORECASE):
+            continue
+        ref = ref.split('#')[0].split('?')[0]
+        path = os.path.normpath(os.path.join(base_dir, ref))
+        if os.path.isfile(path):
+            assets.add(path)
+
+    return sorted(assets)
+
+
+def screenshot_key(html_file, viewport, wait_ms, offline=False):
+    """Content hash identifying one capture of an HTML file (None if it doesn't exist)"""
+    try:
+        with open(html_file, 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None
+
+    h = hashlib.sha256(content)
+    base_dir = os.path.dirname(os.path.abspath(html_file))
+    for asset in local_assets(html_file, content.decode('utf-8', errors='ignore')):
+        h.update(os.path.relpath(asset, base_dir).encode())
+        hash_file(asset, h)
+
+    h.update(json.dumps({
+        'viewport': list(viewport),
+        'wait_ms': wait_ms,
+        'offline': offline
+    }, sort_keys=True).encode())
+
+    return h.hexdigest()
+
+
+class ScreenshotCache(DiskLRUCache):
+    """PNG screenshots by screenshot_key"""
+
+    def __init__(self, cache_dir="cache/screenshots", max_bytes=256 * 1024 * 1024):
+        super().__init__(cache_dir, max_bytes, suffix='.png')
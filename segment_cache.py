@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cache of pre-encoded H.264 segments for static slides
+A slide is encoded once per (content, duration, fps, encoder settings) and
+final assembly stream-copies the cached segments together
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+from PIL import Image
+from disk_cache import DiskLRUCache, hash_file
+from frame_pipe import FramePipeWriter
+
+
+def frame_content_hash(frame):
+    """Content hash for a slide given as a PIL image or an image path"""
+    if isinstance(frame, Image.Image):
+        h = hashlib.sha256(f"{frame.mode}:{frame.size}".encode())
+        h.update(frame.tobytes())
+        return h.hexdigest()
+    return hash_file(frame).hexdigest()
+
+
+def concat_segments(segment_paths, output_path, list_path):
+    """Join segments with identical encoding into one file without re-encoding"""
+    with open(list_path, 'w') as f:
+        for segment in segment_paths:
+            f.write(f"file '{os.path.abspath(segment)}'\n")
+
+    cmd = [
+        'ffmpeg', '-y',
+        '-loglevel', 'error',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', list_path,
+        '-c', 'copy',
+        output_path
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+    return output_path
+
+
+class SegmentCache(DiskLRUCache):
+    """Encoded still-slide segments keyed on content and encoder settings"""
+
+    def __init__(self, cache_dir="cache/segments", max_bytes=1024 * 1024 * 1024,
+                 preset='fast', crf=23, pix_fmt='yuv420p'):
+        super().__init__(cache_dir, max_bytes, suffix='.mp4')
+        self.preset = preset
+        self.crf = crf
+        self.pix_fmt = pix_fmt
+
+        self.hits = 0
+        self.misses = 0
+
+    def segment_key(self, content_key, duration, fps, width, height):
+        settings = {
+            'content': content_key,
+            'duration': duration,
+            'fps': fps,
+            'size': [width, height],
+            'codec': 'libx264',
+            'preset': self.preset,
+            'crf': self.crf,
+            'pix_fmt': self.pix_fmt
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def get_segment(self, frame, duration, fps=30, width=1080, height=1920, content_key=None,
+                    threads=None):
+        """Path to an encoded segment of `frame` held for `duration` seconds
+
+        Encodes (and caches) the segment on a miss. Pass content_key to skip
+        hashing when the caller already knows what the frame contains; `frame`
+        may then be a callable that renders the image only on a miss.
+        """
+        content_key = content_key or frame_content_hash(frame)
+        key = self.segment_key(content_key, duration, fps, width, height)
+
+        cached = self.get(key)
+        if cached:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if callable(frame):
+            frame = frame()
+
+        tmp_path = self.temp_path(key, '.tmp.mp4')
+        writer = FramePipeWriter(tmp_path, width, height, fps,
+                                 pix_fmt=self.pix_fmt, preset=self.preset, crf=self.crf,
+                                 threads=threads)
+        with writer:
+            writer.write_frame(frame, duration)
+
+        return self.put(key, tmp_path, move=True)
+
+    def encode_video(self, frames, durations, output_path, list_path,
+                     fps=30, width=1080, height=1920, threads=None):
+        """Assemble a slideshow from cached segments with a single `-c copy` pass"""
+        segments = [
+            self.get_segment(frame, duration, fps, width, height, threads=threads)
+            for frame, duration in zip(frames, durations)
+        ]
+        return concat_segments(segments, output_path, list_path)
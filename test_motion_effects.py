@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Tests for motion_effects argument checks (no FFmpeg needed: they fail before encoding)
+"""
+
+import pytest
+from PIL import Image
+from motion_effects import render_slideshow_with_motion
+from automation import SimpleVideoCreator
+
+
+def test_effects_shorter_than_frames_raises(tmp_path):
+    frames = [Image.new('RGB', (64, 64), 'red') for _ in range(3)]
+    with pytest.raises(ValueError, match="3 frames, 3 durations, 1 effects"):
+        render_slideshow_with_motion(frames, [2, 2, 2], [{'type': 'ken_burns'}],
+                                     str(tmp_path / 'out.mp4'), str(tmp_path / 'list.txt'),
+                                     width=64, height=64, segment_dir=str(tmp_path / 'seg'))
+    assert not (tmp_path / 'out.mp4').exists()
+
+
+def test_creator_rejects_short_effects_list(tmp_path):
+    creator = SimpleVideoCreator()
+    frames = [Image.new('RGB', (64, 64), 'red') for _ in range(3)]
+    with pytest.raises(ValueError):
+        creator.create_video_from_images(frames, [2, 2, 2], str(tmp_path / 'out.mp4'),
+                                         effects=[{'type': 'ken_burns'}])
+    assert not (tmp_path / 'out.mp4').exists()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Rasterized text sprite cache
+Each (text, font, size, colors, shadow/glow) is measured and drawn once into a
+pre-composited RGBA sprite; every later use is a single alpha paste
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from PIL import Image, ImageColor, ImageDraw, ImageFilter
+from fonts import get_font
+
+# image: RGBA sprite, offset: sprite position relative to the text origin,
+# bbox: the text's own bounding box (same as draw.textbbox((0, 0), ...))
+TextSprite = namedtuple('TextSprite', ['image', 'offset', 'bbox'])
+
+# The classic 3px black drop shadow used across the slide builders
+TEXT_SHADOW = (3, 3, '#000000')
+
+
+def _rgba(color):
+    if isinstance(color, str):
+        color = ImageColor.getrgb(color)
+    color = tuple(color)
+    return color if len(color) == 4 else color + (255,)
+
+
+def _layer(size, origin, text, font, color, blur=0):
+    """Solid-color RGBA layer whose alpha is the text coverage"""
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).text(origin, text, fill=255, font=font)
+    if blur:
+        mask = mask.filter(ImageFilter.GaussianBlur(blur))
+
+    layer = Image.new('RGBA', size, color[:3] + (0,))
+    if color[3] < 255:
+        mask = mask.point(lambda v: v * color[3] // 255)
+    layer.putalpha(mask)
+    return layer
+
+
+@lru_cache(maxsize=1024)
+def text_bbox(text, size, family='regular'):
+    """Text bounding box at the origin (cached)"""
+    return get_font(size, family).getbbox(text)
+
+
+@lru_cache(maxsize=256)
+def _render_sprite(text, size, fill, family, shadow, glow):
+    font = get_font(size, family)
+    bbox = text_bbox(text, size, family)
+    if bbox[2] <= bbox[0] or bbox[3] <= bbox[1]:
+        return None
+
+    # Canvas covers the text, its shadow and the glow's spread
+    left, top, right, bottom = bbox
+    if shadow:
+        dx, dy, _ = shadow
+        left, top = min(left, bbox[0] + dx), min(top, bbox[1] + dy)
+        right, bottom = max(right, bbox[2] + dx), max(bottom, bbox[3] + dy)
+    if glow:
+        spread = glow[1] * 2
+        left, top, right, bottom = left - spread, top - spread, right + spread, bottom + spread
+
+    size_px = (right - left, bottom - top)
+    origin = (-left, -top)
+    sprite = Image.new('RGBA', size_px, (0, 0, 0, 0))
+
+    # Bottom to top: glow, shadow, text
+    if glow:
+        sprite.alpha_composite(_layer(size_px, origin, text, font, glow[0], glow[1]))
+    if shadow:
+        dx, dy, color = shadow
+        sprite.alpha_composite(_layer(size_px, (origin[0] + dx, origin[1] + dy), text, font, color))
+    sprite.alpha_composite(_layer(size_px, origin, text, font, fill))
+
+    return TextSprite(sprite, (left, top), bbox)
+
+
+def text_sprite(text, size, fill='#FFFFFF', family='regular', shadow=None, glow=None):
+    """Cached sprite for a string (None for blank text)
+
+    shadow: (dx, dy, color) drop shadow drawn under the text
+    glow: (color, radius) halo under the text; radius 0 is a same-shape underlay
+    """
+    shadow = (shadow[0], shadow[1], _rgba(shadow[2])) if shadow else None
+    glow = (_rgba(glow[0]), glow[1]) if glow else None
+    return _render_sprite(text, size, _rgba(fill), family, shadow, glow)
+
+
+def line_width(text, size, family='regular'):
+    """Rendered width of a single line (cached)"""
+    bbox = text_bbox(text, size, family)
+    return bbox[2] - bbox[0]
+
+
+def paste_text(img, xy, text, size, fill='#FFFFFF', family='regular', shadow=None, glow=None):
+    """Draw text at xy like draw.text(xy, ...) would, as one alpha paste"""
+    sprite = text_sprite(text, size, fill, family, shadow, glow)
+    if sprite is not None:
+        x, y = xy
+        img.paste(sprite.image, (x + sprite.offset[0], y + sprite.offset[1]), sprite.image)
+    return sprite
+
+
+def paste_centered_text(img, y, text, size, fill='#FFFFFF', family='regular',
+                        shadow=None, glow=None):
+    """Horizontally centered text at y; returns the x it was drawn at"""
+    x = (img.width - line_width(text, size, family)) // 2
+    paste_text(img, (x, y), text, size, fill, family, shadow, glow)
+    return x
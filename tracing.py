@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Lightweight stage/frame tracing with Chrome trace-event export
+Each span records wall time, CPU time of the thread that ran it (so
+overlapping spans on other threads don't count) and CPU time of child
+processes (ffmpeg, npx) that finished during it, process-wide. Open the JSON in chrome://tracing
+or Perfetto.
+
+Enable per object (trace=True) or for everything with AUTOMATION_TRACE=1.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: no child rusage, subprocess time is reported as 0
+    resource = None
+
+TRACE_ENV = 'AUTOMATION_TRACE'
+
+
+def trace_enabled(flag=None):
+    """Explicit flag wins; otherwise AUTOMATION_TRACE=1/true/yes/on turns tracing on"""
+    if flag is not None:
+        return bool(flag)
+    return os.environ.get(TRACE_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def child_cpu_time():
+    """CPU seconds used by terminated, waited-for child processes"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class Tracer:
+    """Collects spans; export() writes Chrome trace JSON, summary() one line"""
+
+    enabled = True
+
+    def __init__(self, name='trace', output_dir='traces'):
+        self.name = name
+        self.output_dir = output_dir
+        self.spans = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, cat='stage', **args):
+        """Time the enclosed block as one span"""
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        child = child_cpu_time()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            record = {
+                'name': name,
+                'cat': cat,
+                'start': wall - self._origin,
+                'wall': end - wall,
+                'cpu': time.thread_time() - cpu,
+                'child': child_cpu_time() - child,
+                'tid': threading.get_ident(),
+                'args': args
+            }
+            with self._lock:
+                self.spans.append(record)
+
+    def chrome_events(self):
+        """Spans as complete ('X') trace events, timestamps in microseconds"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        return [
+            {
+                'name': s['name'],
+                'cat': s['cat'],
+                'ph': 'X',
+                'ts': round(s['start'] * 1e6, 1),
+                'dur': round(s['wall'] * 1e6, 1),
+                'pid': pid,
+                'tid': s['tid'],
+                'args': {
+                    **{k: str(v) for k, v in s['args'].items()},
+                    'thread_cpu_ms': round(s['cpu'] * 1000, 3),
+                    'subprocess_ms': round(s['child'] * 1000, 3)
+                }
+            }
+            for s in sorted(spans, key=lambda s: s['start'])
+        ]
+
+    def export(self, path=None):
+        """Write the Chrome trace-event JSON; returns its path"""
+        if path is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            path = os.path.join(self.output_dir, f"{self.name}_{stamp}.json")
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.chrome_events(), 'displayTimeUnit': 'ms'}, f)
+        return path
+
+    def summary(self):
+        """One line: root span totals, then time per stage and frame count"""
+        with self._lock:
+            spans = list(self.spans)
+        if not spans:
+            return f"{self.name}: no spans"
+
+        roots = [s for s in spans if s['cat'] == 'root'] or spans
+        wall = sum(s['wall'] for s in roots)
+        cpu = sum(s['cpu'] for s in roots)
+        child = sum(s['child'] for s in roots)
+
+        stages = {}
+        for s in spans:
+            if s['cat'] == 'stage':
+                stages[s['name']] = stages.get(s['name'], 0.0) + s['wall']
+        frames = sum(1 for s in spans if s['cat'] == 'frame')
+
+        parts = [f"{name} {secs:.2f}s" for name, secs in stages.items()]
+        if frames:
+            parts.append(f"{frames} frames")
+        return (f"{self.name}: {wall:.2f}s wall, {cpu:.2f}s thread cpu, {child:.2f}s subprocess"
+                + (f" | {', '.join(parts)}" if parts else ""))
+
+    def finish(self):
+        """Export the trace, print the summary line and start a fresh trace"""
+        path = self.export()
+        print(f"⏱️ {self.summary()} (trace: {path})")
+        with self._lock:
+            self.spans = []
+        return path
+
+
+class NullTracer:
+    """Tracing switched off: span() hands back one shared no-op context"""
+
+    enabled = False
+    _null_span = nullcontext()
+
+    def span(self, name, cat='stage', **args):
+        return self._null_span
+
+    def summary(self):
+        return ""
+
+    def finish(self):
+        return None
+
+
+NULL_TRACER = NullTracer()
+
+
+def make_tracer(flag=None, name='trace', output_dir='traces'):
+    """A Tracer when enabled by flag or AUTOMATION_TRACE, else the shared NullTracer"""
+    return Tracer(name, output_dir) if trace_enabled(flag) else NULL_TRACER
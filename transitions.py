@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Slide transitions as a single FFmpeg xfade filter graph
+Every slide is an input and consecutive slides are chained through xfade,
+so crossfades, slides and wipes cost one FFmpeg process
+"""
+
+import os
+import subprocess
+from PIL import Image
+
+# Friendly names -> xfade transition names (raw xfade names also work)
+TRANSITIONS = {
+    'fade': 'fade',
+    'slide': 'slideleft',
+    'wipe': 'wipeleft',
+    'zoom': 'zoomin'
+}
+
+
+def xfade_transition(name):
+    return TRANSITIONS.get(name, name)
+
+
+def fit_transition_duration(durations, transition_duration):
+    """Longest usable transition: no slide may be overlapped for more than half its length"""
+    if len(durations) < 2:
+        return 0
+    return max(0, min(transition_duration, min(durations) / 2))
+
+
+def xfade_offsets(durations, transition_duration):
+    """Start time of each transition in the output timeline
+
+    Transition k (into slide k) starts at sum(d_0..d_{k-1}) - k*T, because
+    every earlier transition overlapped two slides by T.
+    """
+    offsets = []
+    elapsed = 0
+    for k, duration in enumerate(durations[:-1], start=1):
+        elapsed += duration
+        offsets.append(round(elapsed - k * transition_duration, 3))
+    return offsets
+
+
+def build_xfade_graph(durations, transition='fade', transition_duration=0.5,
+                      fps=30, width=1080, height=1920):
+    """filter_complex chaining every input through xfade; output label [vout]"""
+    name = xfade_transition(transition)
+
+    # Each input is one decoded still, repeated in-graph for its duration
+    filters = [
+        f"[{i}:v]scale={width}:{height},setsar=1,format=yuv420p,"
+        f"tpad=stop={max(1, round(duration * fps)) - 1}:stop_mode=clone[s{i}]"
+        for i, duration in enumerate(durations)
+    ]
+
+    if len(durations) > 1 and transition_duration <= 0:
+        # No room for a transition: plain cuts
+        inputs = ''.join(f"[s{i}]" for i in range(len(durations)))
+        filters.append(f"{inputs}concat=n={len(durations)}:v=1:a=0[vout]")
+        return ';'.join(filters)
+
+    previous = 's0'
+    for k, offset in enumerate(xfade_offsets(durations, transition_duration), start=1):
+        label = 'vout' if k == len(durations) - 1 else f"x{k}"
+        filters.append(
+            f"[{previous}][s{k}]xfade=transition={name}"
+            f":duration={transition_duration}:offset={offset}[{label}]"
+        )
+        previous = label
+
+    if len(durations) == 1:
+        filters[0] = filters[0].replace('[s0]', '[vout]')
+    return ';'.join(filters)
+
+
+def build_xfade_command(image_paths, durations, output_path, transition='fade',
+                        transition_duration=0.5, fps=30, width=1080, height=1920,
+                        preset='fast', crf=23, threads=None):
+    inputs = []
+    for path in image_paths:
+        inputs += ['-framerate', str(fps), '-i', path]
+
+    graph = build_xfade_graph(durations, transition, transition_duration, fps, width, height)
+    thread_args = ['-threads', str(threads)] if threads else []
+    return [
+        'ffmpeg', '-y',
+        '-loglevel', 'error',
+        *inputs,
+        '-filter_complex', graph,
+        '-map', '[vout]',
+        '-r', str(fps),
+        '-c:v', 'libx264',
+        '-preset', preset,
+        '-crf', str(crf),
+        *thread_args,
+        output_path
+    ]
+
+
+def render_xfade_slideshow(frames, durations, output_path, transition='fade',
+                           transition_duration=0.5, fps=30, width=1080, height=1920,
+                           temp_dir='temp', threads=None):
+    """Encode a slideshow with transitions between every pair of slides
+
+    frames may be image paths or PIL images (written to temp_dir as inputs).
+    The result is shorter than sum(durations) by one transition per cut.
+    """
+    transition_duration = fit_transition_duration(durations, transition_duration)
+
+    written = []
+    paths = []
+    for i, frame in enumerate(frames):
+        if isinstance(frame, Image.Image):
+            path = os.path.join(temp_dir, f"xfade_{os.getpid()}_{i:03d}.png")
+            frame.save(path)
+            written.append(path)
+            frame = path
+        paths.append(frame)
+
+    cmd = build_xfade_command(paths, list(durations), output_path, transition,
+                              transition_duration, fps, width, height, threads=threads)
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    finally:
+        for path in written:
+            os.remove(path)
+    return output_path
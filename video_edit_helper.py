@@ -1,56 +1,218 @@
 #!/usr/bin/env python3
 """
 Helper script for making minimal edits to generated videos
+
+Edits are non-destructive: each one is recorded in an edit decision list (EDL)
+and rebuild_video applies them all in a single render + encode pass.
 """
 
 import os
+import re
+import copy
 import json
+import hashlib
 import subprocess
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
+from text_sprites import TEXT_SHADOW, paste_text, paste_centered_text, line_width
+from frame_pipe import FramePipeWriter
+from disk_cache import hash_file
+from segment_cache import SegmentCache, concat_segments
+from frame_hash import dhash_bits, hashes_to_hex, duplicate_runs
+from tracing import make_tracer
+from workspace import Workspace, DEFAULT_MAX_BYTES, output_stamp
 
 class VideoEditHelper:
-    def __init__(self, project_name):
+    def __init__(self, project_name, trace=None, scratch_root=None,
+                 scratch_max_bytes=DEFAULT_MAX_BYTES):
         self.project_name = project_name
         self.width = 1080
         self.height = 1920
         self.fps = 30
+        self.default_duration = 2.0
+        
+        # Edit decision list: one entry per output slide, in order
+        #   {'source': frame path, 'duration': seconds, 'ops': [edit, ...]}
+        # None until loaded; an empty list is a timeline with every frame removed
+        self.timeline = None
+        
+        # Perceptual hash per frame path (filled by dedupe_frames / preview_frames)
+        self.frame_hashes = {}
+        
+        # Stage/frame spans (trace=True or AUTOMATION_TRACE=1); a no-op when off
+        self.tracer = make_tracer(trace, f"{project_name}_rebuild")
+        
+        # Source frames are kept per project, so editing one project never
+        # clears another's frames
+        self.frame_dir = os.path.join("edits", "frames", project_name)
+        os.makedirs(self.frame_dir, exist_ok=True)
         
-        # Create edit workspace
-        os.makedirs("edits", exist_ok=True)
-        os.makedirs("edits/frames", exist_ok=True)
+        # Scratch space for rebuild intermediates (RAM-backed when possible)
+        self.workspace = Workspace(f"{project_name}_edit", scratch_root, scratch_max_bytes)
         
-    def extract_frames_from_video(self, video_path):
-        """Extract all frames from existing video"""
+        # Encoded slides from earlier rebuilds, reused by incremental rebuilds
+        self.segment_store = SegmentCache(f"edits/segments/{project_name}")
+        
+    def extract_frames_from_video(self, video_path, mode='fps', scene_threshold=0.01,
+                                  dedupe=False):
+        """Extract frames from existing video
+        
+        mode='fps' samples one frame per second. mode='scene' keeps one frame per
+        distinct slide (ffmpeg scene detection) and records each slide's measured
+        duration, so rebuild_video keeps the original timing.
+        
+        dedupe=True collapses runs of identical frames afterwards (dedupe_frames).
+        """
         print(f"📸 Extracting frames from {video_path}...")
         
         # Clear existing frames
-        frame_dir = "edits/frames"
-        for f in os.listdir(frame_dir):
+        for f in os.listdir(self.frame_dir):
             if f.endswith('.png'):
-                os.remove(os.path.join(frame_dir, f))
+                os.remove(os.path.join(self.frame_dir, f))
+        
+        self.frame_hashes = {}
+        
+        if mode == 'scene':
+            frames = self.extract_scene_frames(video_path, scene_threshold)
+            return self.dedupe_frames() if dedupe else frames
         
         # Extract frames
         cmd = [
             'ffmpeg',
             '-i', video_path,
             '-vf', 'fps=1',  # Extract 1 frame per second
-            'edits/frames/frame_%03d.png'
+            os.path.join(self.frame_dir, 'frame_%03d.png')
         ]
         
         subprocess.run(cmd, check=True)
         
         # Get frame list
-        frames = sorted([f for f in os.listdir(frame_dir) if f.endswith('.png')])
+        # Each sampled frame stands for one second of the source video
+        frames = self.list_frame_files()
+        self.load_timeline(frames, [1.0] * len(frames))
         print(f"✅ Extracted {len(frames)} frames")
         
-        return [os.path.join(frame_dir, f) for f in frames]
+        return self.dedupe_frames() if dedupe else frames
+    
+    def extract_scene_frames(self, video_path, scene_threshold=0.01):
+        """Extract one frame per slide with its duration (showinfo timestamps)"""
+        # First frame always, then every frame that differs from the one before
+        cmd = [
+            'ffmpeg',
+            '-i', video_path,
+            '-vf', f"select='eq(n\\,0)+gt(scene\\,{scene_threshold})',showinfo",
+            '-fps_mode', 'vfr',
+            os.path.join(self.frame_dir, 'frame_%03d.png')
+        ]
+        
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        
+        # showinfo logs pts_time for each kept frame; the header has the total length
+        starts = [float(t) for t in
+                  re.findall(r'Parsed_showinfo.*?pts_time:\s*([\d.]+)', result.stderr)]
+        match = re.search(r'Duration: (\d+):(\d+):([\d.]+)', result.stderr)
+        if match:
+            hours, minutes, seconds = match.groups()
+            total = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        else:
+            total = (starts[-1] + self.default_duration) if starts else 0.0
+        
+        frames = self.list_frame_files()
+        ends = starts[1:] + [total]
+        durations = [round(end - start, 3) for start, end in zip(starts, ends)]
+        self.load_timeline(frames, durations)
+        
+        print(f"✅ Extracted {len(frames)} slides")
+        for i, entry in enumerate(self.timeline):
+            print(f"  Frame {i}: {entry['duration']}s")
+        
+        return frames
+    
+    def list_frame_files(self):
+        """Frame PNGs on disk, in name order"""
+        frames = sorted([f for f in os.listdir(self.frame_dir) if f.endswith('.png')])
+        return [os.path.join(self.frame_dir, f) for f in frames]
+    
+    def load_timeline(self, frames, durations=None):
+        """Start a fresh edit decision list from source frames"""
+        durations = durations or []
+        self.timeline = [
+            {
+                'source': frame,
+                'duration': durations[i] if i < len(durations) else self.default_duration,
+                'ops': []
+            }
+            for i, frame in enumerate(frames)
+        ]
+        return self.timeline
+    
+    def get_timeline(self):
+        """Current EDL (loaded from the project's frame directory on first use)"""
+        if self.timeline is None:
+            self.load_timeline(self.list_frame_files())
+        return self.timeline
+    
+    def get_entry(self, frame_number):
+        """EDL entry for a frame number, or None (with a message) if it doesn't exist"""
+        timeline = self.get_timeline()
+        if not 0 <= frame_number < len(timeline):
+            print(f"❌ Frame {frame_number} doesn't exist!")
+            return None
+        return timeline[frame_number]
+    
+    def hash_frames(self, frames):
+        """Perceptual hashes for frame paths, via the shared hash index"""
+        missing = [f for f in dict.fromkeys(frames) if f not in self.frame_hashes]
+        if missing:
+            self.frame_hashes.update(zip(missing, hashes_to_hex(dhash_bits(missing))))
+        return [self.frame_hashes[f] for f in frames]
+    
+    def dedupe_frames(self, max_distance=2):
+        """Collapse consecutive identical frames into one slide with a summed duration
+        
+        Frames are compared by perceptual hash (Hamming distance <= max_distance).
+        Only unedited slides are merged; dropped duplicates are deleted from disk.
+        """
+        timeline = self.get_timeline()
+        if len(timeline) < 2:
+            return self.get_current_frames()
+        
+        sources = [entry['source'] for entry in timeline]
+        bits = dhash_bits(sources)
+        self.frame_hashes.update(zip(sources, hashes_to_hex(bits)))
+        
+        merged = []
+        for run in duplicate_runs(bits, max_distance):
+            head = None
+            for i in run:
+                entry = timeline[i]
+                # Edited slides stay separate; their pixels no longer match the source
+                if head is not None and not head['ops'] and not entry['ops']:
+                    head['duration'] = round(head['duration'] + entry['duration'], 3)
+                else:
+                    head = entry
+                    merged.append(entry)
+        
+        # Drop duplicate PNGs nothing points at any more
+        kept = {entry['source'] for entry in merged}
+        for source in set(sources) - kept:
+            if os.path.exists(source):
+                os.remove(source)
+            self.frame_hashes.pop(source, None)
+        
+        print(f"✅ Deduplicated {len(timeline)} frames into {len(merged)} slides")
+        self.timeline = merged
+        
+        return self.get_current_frames()
     
     def preview_frames(self, frames):
         """Show preview of all frames with numbers"""
         print("\n📋 Frame Preview:")
         print("-" * 50)
         
+        hashes = self.hash_frames(frames)
+        first_seen = {}
+        
         for i, frame_path in enumerate(frames):
             # Get frame info
             img = Image.open(frame_path)
@@ -61,6 +223,13 @@ class VideoEditHelper:
             print(f"Frame {i}: {frame_type}")
             print(f"  Path: {frame_path}")
             print(f"  Size: {img.size}")
+            
+            frame_hash = hashes[i]
+            if frame_hash in first_seen:
+                print(f"  Hash: {frame_hash[:16]} (same as frame {first_seen[frame_hash]})")
+            else:
+                first_seen[frame_hash] = i
+                print(f"  Hash: {frame_hash[:16]}")
             print()
     
     def detect_frame_type(self, img):
@@ -80,141 +249,136 @@ class VideoEditHelper:
         else:
             return "Content frame"
     
-    def edit_text_frame(self, frame_number, new_text_lines, output_path=None):
-        """Replace text in a specific frame"""
-        frames = self.get_current_frames()
-        
-        if frame_number >= len(frames):
-            print(f"❌ Frame {frame_number} doesn't exist!")
-            return None
-        
-        # Create new text frame
+    def render_text_frame(self, text_lines):
+        """Fresh text frame (the look used by edit_text_frame)"""
         img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 70)
-        except:
-            font = ImageFont.load_default()
         
-        # Draw new text
+        # Draw new text (shadowed sprites are cached across edits)
         y = 600
-        for line in new_text_lines:
-            bbox = draw.textbbox((0, 0), line, font=font)
-            x = (self.width - (bbox[2] - bbox[0])) // 2
-            
-            # Shadow
-            draw.text((x+3, y+3), line, fill='#000000', font=font)
-            draw.text((x, y), line, fill='#FFFFFF', font=font)
+        for line in text_lines:
+            paste_centered_text(img, y, line, 70, shadow=TEXT_SHADOW)
             
             y += 90
         
-        # Save
-        if not output_path:
-            output_path = frames[frame_number]
+        return img
+    
+    def draw_overlay(self, img, overlay_text, position='bottom'):
+        """Draw a text overlay box onto an image in place"""
+        draw = ImageDraw.Draw(img)
+        
+        # Calculate position
+        text_width = line_width(overlay_text, 50)
+        x = (self.width - text_width) // 2
+        
+        if position == 'bottom':
+            y = self.height - 200
+        elif position == 'top':
+            y = 100
+        else:  # center
+            y = self.height // 2
+        
+        # Draw background box
+        padding = 20
+        draw.rounded_rectangle(
+            [x - padding, y - padding, 
+             x + text_width + padding, y + 60 + padding],
+            radius=10,
+            fill=(0, 0, 0, 180)
+        )
+        
+        # Draw text
+        paste_text(img, (x, y), overlay_text, 50)
+        
+        return img
+    
+    def load_source(self, path, sources=None):
+        """Decode a source frame at output size (once per rebuild via `sources`)"""
+        if sources is not None and path in sources:
+            return sources[path]
+        
+        img = Image.open(path).convert('RGB')
+        if img.size != (self.width, self.height):
+            img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
+        
+        if sources is not None:
+            sources[path] = img
+        return img
+    
+    def render_entry(self, entry, sources=None):
+        """Apply an entry's recorded edits to its source frame"""
+        img = None
+        
+        for op in entry['ops']:
+            if op['op'] == 'text':
+                # Full replacements never need the source decoded
+                img = self.render_text_frame(op['lines'])
+            elif op['op'] == 'replace':
+                img = self.load_source(op['image'], sources).copy()
+            elif op['op'] == 'overlay':
+                if img is None:
+                    img = self.load_source(entry['source'], sources).copy()
+                self.draw_overlay(img, op['text'], op['position'])
+        
+        if img is None:
+            img = self.load_source(entry['source'], sources)
+        return img
+    
+    def edit_text_frame(self, frame_number, new_text_lines, output_path=None):
+        """Replace text in a specific frame
+        
+        With output_path, the new frame is rendered straight to that file instead
+        of being recorded in the edit list.
+        """
+        entry = self.get_entry(frame_number)
+        if entry is None:
+            return None
+        
+        if output_path:
+            self.render_text_frame(new_text_lines).save(output_path)
+            print(f"✅ Rendered new text for frame {frame_number}: {output_path}")
+            return output_path
         
-        img.save(output_path)
+        entry['ops'].append({'op': 'text', 'lines': list(new_text_lines)})
         print(f"✅ Updated frame {frame_number}")
         
-        return output_path
+        return entry
     
     def remove_frame(self, frame_number):
         """Remove a frame from the sequence"""
-        frames = self.get_current_frames()
-        
-        if frame_number >= len(frames):
-            print(f"❌ Frame {frame_number} doesn't exist!")
+        if self.get_entry(frame_number) is None:
             return
         
-        # Delete the frame
-        os.remove(frames[frame_number])
+        self.timeline.pop(frame_number)
         print(f"✅ Removed frame {frame_number}")
-        
-        # Renumber remaining frames
-        self.renumber_frames()
     
     def duplicate_frame(self, frame_number, insert_after=None):
-        """Duplicate a frame"""
-        frames = self.get_current_frames()
-        
-        if frame_number >= len(frames):
-            print(f"❌ Frame {frame_number} doesn't exist!")
+        """Duplicate a frame (with its edits), placed right after insert_after"""
+        entry = self.get_entry(frame_number)
+        if entry is None:
             return
         
-        # Copy frame
-        source = frames[frame_number]
         if insert_after is None:
             insert_after = frame_number
         
-        # Create new filename
-        new_path = f"edits/frames/frame_dup_{datetime.now().timestamp()}.png"
-        img = Image.open(source)
-        img.save(new_path)
-        
+        self.timeline.insert(insert_after + 1, copy.deepcopy(entry))
         print(f"✅ Duplicated frame {frame_number}")
-        
-        # Renumber frames
-        self.renumber_frames()
     
     def replace_frame_content(self, frame_number, new_image_path):
         """Replace a frame with a new image"""
-        frames = self.get_current_frames()
-        
-        if frame_number >= len(frames):
-            print(f"❌ Frame {frame_number} doesn't exist!")
+        entry = self.get_entry(frame_number)
+        if entry is None:
             return
         
-        # Load and resize new image
-        new_img = Image.open(new_image_path)
-        new_img = new_img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-        
-        # Save over existing frame
-        new_img.save(frames[frame_number])
+        entry['ops'].append({'op': 'replace', 'image': new_image_path})
         print(f"✅ Replaced frame {frame_number}")
     
     def add_overlay_to_frame(self, frame_number, overlay_text, position='bottom'):
         """Add text overlay to existing frame"""
-        frames = self.get_current_frames()
-        
-        if frame_number >= len(frames):
-            print(f"❌ Frame {frame_number} doesn't exist!")
+        entry = self.get_entry(frame_number)
+        if entry is None:
             return
         
-        # Load frame
-        img = Image.open(frames[frame_number])
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-        except:
-            font = ImageFont.load_default()
-        
-        # Calculate position
-        bbox = draw.textbbox((0, 0), overlay_text, font=font)
-        text_width = bbox[2] - bbox[0]
-        x = (self.width - text_width) // 2
-        
-        if position == 'bottom':
-            y = self.height - 200
-        elif position == 'top':
-            y = 100
-        else:  # center
-            y = self.height // 2
-        
-        # Draw background box
-        padding = 20
-        draw.rounded_rectangle(
-            [x - padding, y - padding, 
-             x + text_width + padding, y + 60 + padding],
-            radius=10,
-            fill=(0, 0, 0, 180)
-        )
-        
-        # Draw text
-        draw.text((x, y), overlay_text, fill='#FFFFFF', font=font)
-        
-        # Save
-        img.save(frames[frame_number])
+        entry['ops'].append({'op': 'overlay', 'text': overlay_text, 'position': position})
         print(f"✅ Added overlay to frame {frame_number}")
     
     def change_frame_duration(self, frame_durations):
@@ -223,105 +387,156 @@ class VideoEditHelper:
         Args:
             frame_durations: dict of {frame_number: duration_in_seconds}
         """
-        self.frame_durations = frame_durations
+        timeline = self.get_timeline()
+        for frame_number, duration in frame_durations.items():
+            if 0 <= frame_number < len(timeline):
+                timeline[frame_number]['duration'] = duration
         print(f"✅ Updated frame durations")
     
     def get_current_frames(self):
-        """Get current frame list"""
-        frame_dir = "edits/frames"
-        frames = sorted([f for f in os.listdir(frame_dir) if f.endswith('.png')])
-        return [os.path.join(frame_dir, f) for f in frames]
+        """Source frame for each slide in the current edit list"""
+        return [entry['source'] for entry in self.get_timeline()]
     
-    def renumber_frames(self):
-        """Renumber frames to be sequential"""
-        frames = self.get_current_frames()
-        
-        # Sort by modification time to maintain order
-        frames.sort(key=lambda x: os.path.getmtime(x))
-        
-        # Rename to temporary names first
-        temp_names = []
-        for i, old_path in enumerate(frames):
-            temp_path = f"edits/frames/temp_{i:03d}.png"
-            os.rename(old_path, temp_path)
-            temp_names.append(temp_path)
+    def entry_content_key(self, entry):
+        """Hash of everything that decides what a slide looks like"""
+        ops = []
+        for op in entry['ops']:
+            op = dict(op)
+            if op['op'] == 'replace':
+                op['image'] = hash_file(op['image']).hexdigest()
+            ops.append(op)
+        
+        content = {'source': hash_file(entry['source']).hexdigest(), 'ops': ops}
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+    
+    def rebuild_video(self, output_name=None, custom_durations=None, threads=None,
+                      incremental=False):
+        """Rebuild video from the edit list in one render + encode pass
         
-        # Rename to final names
-        for i, temp_path in enumerate(temp_names):
-            final_path = f"edits/frames/frame_{i:03d}.png"
-            os.rename(temp_path, final_path)
+        Each source frame is decoded once and every edit is applied in memory
+        on the way into the encoder. threads caps the encoder's thread count
+        (see EncodeScheduler).
         
-        print(f"✅ Renumbered {len(frames)} frames")
-    
-    def rebuild_video(self, output_name=None, custom_durations=None):
-        """Rebuild video from edited frames"""
-        frames = self.get_current_frames()
+        incremental=True encodes each slide as its own segment in the project's
+        segment store and only re-encodes slides whose frame, edits or duration
+        changed; the rest are stream-copied.
+        """
+        timeline = self.get_timeline()
         
-        if not frames:
+        if not timeline:
             print("❌ No frames found!")
             return
         
-        print(f"\n🎬 Rebuilding video from {len(frames)} frames...")
+        print(f"\n🎬 Rebuilding video from {len(timeline)} frames...")
         
-        # Default duration or custom
-        if custom_durations:
-            durations = custom_durations
-        else:
-            # Default 2 seconds per frame
-            durations = {i: 2.0 for i in range(len(frames))}
-        
-        # Create concat file
-        concat_file = "edits/concat.txt"
-        with open(concat_file, 'w') as f:
-            for i, frame_path in enumerate(frames):
-                duration = durations.get(i, 2.0)
-                f.write(f"file '{os.path.abspath(frame_path)}'\n")
-                f.write(f"duration {duration}\n")
-            # Last frame
-            f.write(f"file '{os.path.abspath(frames[-1])}'\n")
+        # Custom durations override the edit list per frame number
+        custom_durations = custom_durations or {}
         
         # Output path
         if not output_name:
             output_name = f"{self.project_name}_edited"
         
-        output_path = f"output/{output_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
+        output_path = f"output/{output_name}_{output_stamp()}.mp4"
         
-        # FFmpeg command
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', concat_file,
-            '-vf', f'fps={self.fps},format=yuv420p',
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
-            output_path
-        ]
+        with self.tracer.span('rebuild_video', cat='root', frames=len(timeline),
+                              incremental=incremental):
+            if incremental:
+                self.rebuild_segments(timeline, custom_durations, output_path, threads)
+            else:
+                self.rebuild_piped(timeline, custom_durations, output_path, threads)
         
-        subprocess.run(cmd, check=True)
-        print(f"✅ Video rebuilt: {output_path}")
+        if self.tracer.enabled:
+            self.tracer.finish()
         
         return output_path
     
-    def create_edit_config(self):
-        """Save current edit configuration"""
-        frames = self.get_current_frames()
+    def rebuild_piped(self, timeline, custom_durations, output_path, threads=None):
+        """Render every entry and stream it into a single encoder"""
+        sources = {}
+        tracer = self.tracer
+        
+        writer = FramePipeWriter(output_path, self.width, self.height, self.fps, threads=threads)
+        with writer:
+            for i, entry in enumerate(timeline):
+                duration = custom_durations.get(i, entry['duration'])
+                with tracer.span(f"frame {i}", cat='frame', ops=len(entry['ops'])):
+                    with tracer.span('render', cat='render'):
+                        frame = self.render_entry(entry, sources)
+                    with tracer.span('pipe_write', cat='encode'):
+                        writer.write_frame(frame, duration)
+            
+            # Waiting for ffmpeg to drain is where most of the encode lands
+            with tracer.span('encode', cat='stage'):
+                writer.close()
+        
+        print(f"✅ Video rebuilt: {output_path}")
+    
+    def rebuild_segments(self, timeline, custom_durations, output_path, threads=None):
+        """Reuse stored segments for unchanged slides, re-encode the rest"""
+        sources = {}
+        store = self.segment_store
+        hits, misses = store.hits, store.misses
+        
+        segments = []
+        for i, entry in enumerate(timeline):
+            with self.tracer.span(f"frame {i}", cat='frame', ops=len(entry['ops'])):
+                segments.append(store.get_segment(
+                    lambda entry=entry: self.render_entry(entry, sources),
+                    custom_durations.get(i, entry['duration']),
+                    self.fps, self.width, self.height,
+                    content_key=self.entry_content_key(entry),
+                    threads=threads
+                ))
+        
+        with self.tracer.span('concat', cat='stage', segments=len(segments)):
+            with self.workspace.scratch_file('segments_', '.txt') as list_path:
+                concat_segments(segments, output_path, list_path)
+        print(f"✅ Video rebuilt: {output_path} "
+              f"({store.misses - misses} re-encoded, {store.hits - hits} reused)")
+    
+    def close(self):
+        """Delete the scratch workspace"""
+        self.workspace.close()
+    
+    def create_edit_config(self, config_path=None):
+        """Save the edit decision list so it can be restored and replayed"""
+        timeline = self.get_timeline()
         
         config = {
             'project': self.project_name,
-            'frames': [os.path.basename(f) for f in frames],
-            'durations': getattr(self, 'frame_durations', {}),
+            'frames': [os.path.basename(entry['source']) for entry in timeline],
+            'durations': {i: entry['duration'] for i, entry in enumerate(timeline)},
+            'timeline': timeline,
             'timestamp': datetime.now().isoformat()
         }
         
-        config_path = f"edits/edit_config_{self.project_name}.json"
+        config_path = config_path or f"edits/edit_config_{self.project_name}.json"
         with open(config_path, 'w') as f:
             json.dump(config, f, indent=2)
         
         print(f"✅ Saved edit configuration: {config_path}")
         
         return config_path
+    
+    def load_edit_config(self, config_path=None):
+        """Restore an edit decision list saved by create_edit_config"""
+        config_path = config_path or f"edits/edit_config_{self.project_name}.json"
+        with open(config_path) as f:
+            config = json.load(f)
+        
+        if 'timeline' in config:
+            self.timeline = config['timeline']
+        else:
+            # Older configs only listed frame files and durations (in the
+            # shared edits/frames directory of earlier versions)
+            frames = [os.path.join("edits/frames", name) for name in config['frames']]
+            durations = config.get('durations', {})
+            self.load_timeline(frames, [durations.get(str(i), self.default_duration)
+                                        for i in range(len(frames))])
+        
+        print(f"✅ Loaded edit configuration: {config_path} ({len(self.timeline)} frames)")
+        
+        return self.timeline
 
 
 # Example usage and common edits
@@ -333,8 +548,8 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # Example workflow:
-    print("\n1️⃣ First, extract frames from your video:")
-    print("   editor.extract_frames_from_video('output/your_video.mp4')")
+    print("\n1️⃣ First, extract one frame per slide from your video:")
+    print("   editor.extract_frames_from_video('output/your_video.mp4', mode='scene')")
     
     print("\n2️⃣ Preview what frames you have:")
     print("   editor.preview_frames(editor.get_current_frames())")
@@ -369,9 +584,9 @@ if __name__ == "__main__":
         draw = ImageDraw.Draw(img)
         draw.text((540, 960), f"Frame {i}", fill='#FFFFFF', anchor='mm', 
                  font=ImageFont.load_default())
-        path = f"edits/frames/frame_{i:03d}.png"
+        path = os.path.join(editor.frame_dir, f"frame_{i:03d}.png")
         img.save(path)
         test_frames.append(path)
     
-    print(f"\n✅ Created {len(test_frames)} test frames in edits/frames/")
+    print(f"\n✅ Created {len(test_frames)} test frames in {editor.frame_dir}/")
     print("You can now test the editing functions!")
@@ -6,18 +6,81 @@ Designed for quick production with pre-built projects
 
 import os
 import json
+import asyncio
 import subprocess
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from datetime import datetime
 import shutil
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from frame_pipe import FramePipeWriter, pipe_frames_to_video, slideshow_rate_args, still_frame_rate
+from browser_pool import BrowserPool
+from screenshot_cache import ScreenshotCache, screenshot_key
+from segment_cache import SegmentCache
+from text_sprites import TEXT_SHADOW, paste_text, paste_centered_text
+from frame_templates import (template_frame, pill, centered_text, placed_text, rectangle,
+                             default_font_text)
+from image_cache import load_fitted
+from motion_effects import render_slideshow_with_motion
+from transitions import render_xfade_slideshow
+from backgrounds import gradient_background
+from tracing import make_tracer, NULL_TRACER
+from layouts import Layout
+from multi_output import pipe_frames_to_outputs
+from workspace import Workspace, DEFAULT_MAX_BYTES, output_stamp
+
+# One independent frame render: a frame builder method name and its arguments,
+# plus the models whose screenshots it draws (empty = ready immediately)
+FrameJob = namedtuple('FrameJob', ['method', 'args', 'kwargs', 'needs'], defaults=((),))
+
+
+def render_frame_job(pipeline, job):
+    """Run a single frame job (module-level so pool workers can unpickle it)"""
+    return getattr(pipeline, job.method)(*job.args, **job.kwargs)
+
 
 class ViralContentPipeline:
-    def __init__(self, project_name="euler_equation"):
+    def __init__(self, project_name="euler_equation", in_memory=False, render_workers=0,
+                 capture_backend='cli', offline=False, screenshot_cache=True,
+                 segment_cache=False, still_vfr=False, trace=None, size='9:16',
+                 scratch_root=None, scratch_max_bytes=DEFAULT_MAX_BYTES):
         self.project_name = project_name
-        self.width = 1080  # TikTok/Reels format
-        self.height = 1920
+        
+        # TikTok/Reels format by default; frame layouts scale to any size
+        self.layout = Layout(size)
+        self.width, self.height = self.layout.size
         self.fps = 30
         
+        # Keep frames as PIL images and pipe them into FFmpeg
+        self.in_memory = in_memory
+        self.pix_fmt = 'yuv420p'
+        
+        # Frame rendering process pool (0 = render in this process)
+        self.render_workers = render_workers
+        self._render_pool = None
+        
+        # Screenshot capture: 'cli' (npx per page) or 'browser' (one persistent Chromium)
+        self.capture_backend = capture_backend
+        self.offline = offline
+        self.viewport = (1200, 800)
+        self.capture_wait_ms = 3000
+        self._browser_pool = None
+        self.screenshot_cache = ScreenshotCache() if screenshot_cache else None
+        
+        # Recurring slides (hooks, CTA, winner) are encoded once and stream-copied
+        self.segment_cache = SegmentCache() if segment_cache else None
+        
+        # Static storylines: one frame per slide (or the lowest exact rate)
+        # instead of 30 identical frames a second; motion/transitions stay CFR
+        self.still_vfr = still_vfr
+        
+        # Stage/frame spans (trace=True or AUTOMATION_TRACE=1); a no-op when off
+        self.tracer = make_tracer(trace, project_name)
+        
+        # Private scratch space for frames and concat lists (RAM-backed when
+        # /dev/shm has room), so concurrent pipelines never share paths
+        self.workspace = Workspace(project_name, scratch_root, scratch_max_bytes)
+        
         # Setup directories
         self.setup_directories()
         
@@ -47,27 +110,104 @@ class ViralContentPipeline:
     
     def setup_directories(self):
         """Create necessary directories"""
-        dirs = ['inputs', 'temp', 'output', 'screenshots']
+        dirs = ['inputs', 'output', 'screenshots']
         for d in dirs:
             os.makedirs(d, exist_ok=True)
     
+    def save_frame(self, img, path):
+        """Save a rendered frame, or keep it in memory for the FFmpeg pipe"""
+        if self.in_memory:
+            return img
+        with self.tracer.span('save_png', cat='io'):
+            img.save(path)
+        return path
+    
+    def temp_frame_path(self, name):
+        """Unique temp frame path in the workspace (safe across render worker processes)"""
+        return self.workspace.unique_path(f"{name}_", '.png')
+    
     def capture_screenshot(self, html_file, output_path):
         """Capture screenshot of HTML file using Playwright"""
         cmd = [
             "npx", "playwright", "screenshot",
             f"file://{os.path.abspath(html_file)}",
             output_path,
-            "--viewport-size=1200,800",
-            "--wait-for-timeout=3000"
+            f"--viewport-size={self.viewport[0]},{self.viewport[1]}",
+            f"--wait-for-timeout={self.capture_wait_ms}"
         ]
         
         try:
             subprocess.run(cmd, check=True, capture_output=True)
             print(f"✓ Screenshot captured: {output_path}")
+            return True
         except subprocess.CalledProcessError as e:
             print(f"✗ Screenshot failed: {e}")
             # Create placeholder
             self.create_placeholder_screenshot(output_path)
+            return False
+    
+    def get_browser_pool(self):
+        """Lazily launch the persistent browser (None if Playwright isn't installed)"""
+        if self._browser_pool is None:
+            try:
+                self._browser_pool = BrowserPool(
+                    viewport=self.viewport,
+                    wait_ms=self.capture_wait_ms,
+                    offline=self.offline
+                ).start()
+            except ImportError:
+                print("⚠️ Playwright Python package not installed, using the npx CLI")
+                self.capture_backend = 'cli'
+            except Exception as e:
+                print(f"⚠️ Browser launch failed ({e}), using the npx CLI")
+                self.capture_backend = 'cli'
+        return self._browser_pool
+    
+    def screenshot_path(self, model):
+        return f"screenshots/{model}_{self.project_name}.png"
+    
+    def capture_screenshots(self, model_htmls):
+        """Capture every model's screenshot, concurrently with the browser backend"""
+        screenshots = {model: self.screenshot_path(model) for model in model_htmls}
+        
+        # Unchanged inputs come straight out of the cache
+        keys = {}
+        pending = {}
+        for model, html_path in model_htmls.items():
+            if self.screenshot_cache:
+                keys[model] = screenshot_key(html_path, self.viewport,
+                                             self.capture_wait_ms, self.offline)
+                if keys[model] and self.screenshot_cache.fetch(keys[model], screenshots[model]):
+                    print(f"✓ Screenshot cached: {screenshots[model]}")
+                    continue
+            pending[model] = (html_path, screenshots[model])
+        
+        if not pending:
+            return screenshots
+        
+        captured = []
+        pool = self.get_browser_pool() if self.capture_backend == 'browser' else None
+        if pool:
+            results = pool.capture_many(list(pending.values()))
+            for (model, (html_path, output_path)), result in zip(pending.items(), results):
+                if isinstance(result, Exception):
+                    print(f"✗ Screenshot failed: {result}")
+                    self.create_placeholder_screenshot(output_path)
+                else:
+                    print(f"✓ Screenshot captured: {output_path}")
+                    captured.append(model)
+        else:
+            for model, (html_path, output_path) in pending.items():
+                if self.capture_screenshot(html_path, output_path):
+                    captured.append(model)
+        
+        # Placeholders are never cached, so failed captures retry next run
+        if self.screenshot_cache:
+            for model in captured:
+                if keys[model]:
+                    self.screenshot_cache.put(keys[model], screenshots[model])
+        
+        return screenshots
     
     def create_placeholder_screenshot(self, output_path):
         """Create a placeholder if screenshot fails"""
@@ -76,64 +216,60 @@ class ViralContentPipeline:
         draw.text((600, 400), "Visualization", fill='#666', anchor='mm')
         img.save(output_path)
     
-    def create_storyline_1_personality(self, model_data):
+    def plan_storyline_1_personality(self, model_data):
         """Vision 1: The Personality Test approach"""
-        frames = []
+        jobs = []
         durations = []
         
         # 1. Hook (2s)
-        hook = self.create_text_frame([
+        jobs.append(FrameJob('create_text_frame', ([
             "I asked 4 AIs to visualize",
             "the SAME math equation...",
             "",
             "Their personalities? 🤯"
-        ], style='dramatic')
-        frames.append(hook)
+        ],), {'style': 'dramatic'}))
         durations.append(2)
         
         # 2. Quick personality reveals (2s each)
         for model, data in model_data.items():
-            frame = self.create_personality_reveal(model, data)
-            frames.append(frame)
+            jobs.append(FrameJob('create_personality_reveal', (model, data), {}, (model,)))
             durations.append(2)
         
         # 3. Split screen comparison (4s)
-        split = self.create_split_screen(model_data, title="Same equation. Different vibes.")
-        frames.append(split)
+        # Drawn from names and vibes only, so it waits for no screenshot
+        jobs.append(FrameJob('create_split_screen', (model_data,),
+                             {'title': "Same equation. Different vibes."}))
         durations.append(4)
         
         # 4. CTA (3s)
-        cta = self.create_text_frame([
+        jobs.append(FrameJob('create_text_frame', ([
             "Which AI matches",
             "YOUR coding style?",
             "",
             "Comment below! 👇",
             "#AIPersonality #CodingStyle"
-        ], style='cta')
-        frames.append(cta)
+        ],), {'style': 'cta'}))
         durations.append(3)
         
-        return frames, durations
+        return jobs, durations
     
-    def create_storyline_2_plot_twist(self, model_data):
+    def plan_storyline_2_plot_twist(self, model_data):
         """Vision 2: The Plot Twist approach"""
-        frames = []
+        jobs = []
         durations = []
         
         # 1. Setup - Show identical equation (3s)
-        equation_frame = self.create_equation_frame(
+        jobs.append(FrameJob('create_equation_frame', (
             "Every AI gave me this:",
             "e^(iπ) + 1 = 0"
-        )
-        frames.append(equation_frame)
+        ), {}))
         durations.append(3)
         
         # 2. Twist setup (2s)
-        twist = self.create_text_frame([
+        jobs.append(FrameJob('create_text_frame', ([
             "But when I asked them",
             "to VISUALIZE it..."
-        ], style='suspense')
-        frames.append(twist)
+        ],), {'style': 'suspense'}))
         durations.append(2)
         
         # 3. Dramatic reveals with reactions (2s each)
@@ -145,36 +281,34 @@ class ViralContentPipeline:
         ]
         
         for i, (model, data) in enumerate(model_data.items()):
-            frame = self.create_dramatic_reveal(model, data, reactions[i])
-            frames.append(frame)
+            jobs.append(FrameJob('create_dramatic_reveal', (model, data, reactions[i]), {},
+                                 (model,)))
             durations.append(2)
         
         # 4. Mind blown moment (3s)
-        mind_blown = self.create_text_frame([
+        jobs.append(FrameJob('create_text_frame', ([
             "Same math.",
             "Same prompt.",
             "TOTALLY different results.",
             "",
             "Why? 🤯"
-        ], style='dramatic')
-        frames.append(mind_blown)
+        ],), {'style': 'dramatic'}))
         durations.append(3)
         
-        return frames, durations
+        return jobs, durations
     
-    def create_storyline_3_competition(self, model_data):
+    def plan_storyline_3_competition(self, model_data):
         """Vision 3: The Competition approach"""
-        frames = []
+        jobs = []
         durations = []
         
         # 1. Hook (2s)
-        hook = self.create_text_frame([
+        jobs.append(FrameJob('create_text_frame', ([
             "Math teachers HATE",
             "this one trick...",
             "",
             "AI Visualization Battle! ⚔️"
-        ], style='dramatic')
-        frames.append(hook)
+        ],), {'style': 'dramatic'}))
         durations.append(2)
         
         # 2. Scoring rounds (2.5s each)
@@ -186,31 +320,85 @@ class ViralContentPipeline:
         }
         
         for model, data in model_data.items():
-            frame = self.create_scoring_frame(model, data, scores.get(model, {}))
-            frames.append(frame)
+            jobs.append(FrameJob('create_scoring_frame', (model, data, scores.get(model, {})), {},
+                                 (model,)))
             durations.append(2.5)
         
         # 3. Winner announcement (3s)
-        winner = self.create_winner_frame()
-        frames.append(winner)
+        jobs.append(FrameJob('create_winner_frame', (), {}))
         durations.append(3)
         
         # 4. CTA (2s)
-        cta = self.create_text_frame([
+        jobs.append(FrameJob('create_text_frame', ([
             "Try it yourself!",
             "Link in bio 🔗",
             "",
             "#AIBattle #MathViz"
-        ], style='cta')
-        frames.append(cta)
+        ],), {'style': 'cta'}))
         durations.append(2)
         
-        return frames, durations
+        return jobs, durations
+    
+    def create_storyline_1_personality(self, model_data):
+        """Render storyline 1 frames in timeline order"""
+        jobs, durations = self.plan_storyline_1_personality(model_data)
+        return self.render_frames(jobs), durations
+    
+    def create_storyline_2_plot_twist(self, model_data):
+        """Render storyline 2 frames in timeline order"""
+        jobs, durations = self.plan_storyline_2_plot_twist(model_data)
+        return self.render_frames(jobs), durations
+    
+    def create_storyline_3_competition(self, model_data):
+        """Render storyline 3 frames in timeline order"""
+        jobs, durations = self.plan_storyline_3_competition(model_data)
+        return self.render_frames(jobs), durations
+    
+    def get_render_pool(self):
+        """Lazily start the shared frame render process pool"""
+        if self._render_pool is None:
+            self._render_pool = ProcessPoolExecutor(max_workers=self.render_workers)
+        return self._render_pool
+    
+    def render_frames(self, jobs):
+        """Render independent frame jobs, in parallel when render_workers is set
+        
+        Frames always come back in the same order as the jobs (timeline order).
+        """
+        if not self.render_workers or len(jobs) < 2:
+            frames = []
+            for job in jobs:
+                with self.tracer.span(job.method, cat='frame'):
+                    frames.append(render_frame_job(self, job))
+            return frames
+        
+        # Workers trace nothing; the parent records the whole batch
+        pool = self.get_render_pool()
+        with self.tracer.span('render_pool', cat='frame_batch', frames=len(jobs),
+                              workers=self.render_workers):
+            return list(pool.map(render_frame_job, [self] * len(jobs), jobs))
+    
+    def close(self):
+        """Shut down the render pool and the capture browser, delete the workspace"""
+        if self._render_pool is not None:
+            self._render_pool.shutdown()
+            self._render_pool = None
+        if self._browser_pool is not None:
+            self._browser_pool.close()
+            self._browser_pool = None
+        self.workspace.close()
+    
+    def __getstate__(self):
+        # Render workers get a copy of the config, never the pools themselves
+        state = self.__dict__.copy()
+        state['_render_pool'] = None
+        state['_browser_pool'] = None
+        state['tracer'] = NULL_TRACER
+        return state
     
     def create_text_frame(self, lines, style='default'):
         """Create a text frame with different styles"""
         img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
-        draw = ImageDraw.Draw(img)
         
         # Style configurations
         styles = {
@@ -221,98 +409,82 @@ class ViralContentPipeline:
         }
         
         config = styles.get(style, styles['default'])
+        L = self.layout
+        size = L.s(config['size'])
         
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", config['size'])
-        except:
-            font = ImageFont.load_default()
-        
-        y = config['y_start']
+        y = L.y(config['y_start'])
         for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=font)
-            x = (self.width - (bbox[2] - bbox[0])) // 2
+            # Shadowed line, rasterized once per (text, style)
+            paste_centered_text(img, y, line, size, config['color'],
+                                shadow=TEXT_SHADOW)
             
-            # Add shadow
-            draw.text((x+3, y+3), line, fill='#000000', font=font)
-            draw.text((x, y), line, fill=config['color'], font=font)
-            
-            y += config['size'] + 30
+            y += size + L.s(30)
         
         # Save
-        path = f"temp/text_{datetime.now().timestamp()}.png"
-        img.save(path)
-        return path
+        return self.save_frame(img, self.temp_frame_path("text"))
     
-    def create_personality_reveal(self, model, data):
-        """Create personality-focused reveal frame"""
-        img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
-        draw = ImageDraw.Draw(img)
+    def frame_template(self, model, kind):
+        """Fresh frame with the static per-model layers of `kind` pre-drawn
         
+        Templates are rendered once per (model info, kind, resolution) and
+        copied for every frame, so builders only draw dynamic content.
+        """
         model_info = self.models[model]
+        color = model_info['color']
+        L = self.layout
+        
+        if kind == 'personality':
+            ops = (
+                pill(model.upper(), L.s(90), L.y(150), L.y(280), L.y(170), color,
+                     padding=L.s(40), radius=L.s(20)),
+                centered_text(L.y(1100), model_info['tagline'], L.s(50), '#CCCCCC'),
+                centered_text(L.y(1180), f"Style: {model_info['style']}", L.s(50), '#CCCCCC')
+            )
+        elif kind == 'dramatic':
+            ops = (placed_text((L.x(50), L.y(100)), model.upper(), L.s(70), color),)
+        elif kind == 'scoring':
+            ops = (
+                placed_text((L.x(100), L.y(100)), model.upper(), L.s(80), color),
+                rectangle([L.x(100), L.y(250), L.x(980), L.y(750)], outline=color, width=L.s(5)),
+                default_font_text((L.x(540), L.y(500)), "[PREVIEW]", '#666', anchor='mm')
+            )
+        else:
+            raise ValueError(f"Unknown frame template: {kind}")
         
-        # Model name with color
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 90)
-            desc_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-        except:
-            title_font = ImageFont.load_default()
-            desc_font = title_font
-        
-        # Title
-        title = model.upper()
-        bbox = draw.textbbox((0, 0), title, font=title_font)
-        x = (self.width - (bbox[2] - bbox[0])) // 2
-        
-        # Colored background
-        draw.rounded_rectangle([x-40, 150, x+bbox[2]-bbox[0]+40, 280],
-                              radius=20, fill=model_info['color'])
-        draw.text((x, 170), title, fill='#FFFFFF', font=title_font)
+        return template_frame((self.width, self.height), '#0a0a0a', ops)
+    
+    def create_personality_reveal(self, model, data):
+        """Create personality-focused reveal frame"""
+        # Title pill, tagline and style come from the model's template
+        img = self.frame_template(model, 'personality')
         
         # Screenshot
+        L = self.layout
         if 'screenshot' in data and os.path.exists(data['screenshot']):
-            ss = Image.open(data['screenshot'])
-            ss.thumbnail((900, 600), Image.Resampling.LANCZOS)
+            ss = load_fitted(data['screenshot'], (L.x(900), L.y(600)))
             x_offset = (self.width - ss.width) // 2
-            img.paste(ss, (x_offset, 350))
+            img.paste(ss, (x_offset, L.y(350)))
         
-        # Personality traits
-        traits = [
-            model_info['tagline'],
-            f"Style: {model_info['style']}",
-            f"Vibe: {data.get('vibe', 'Unique')}"
-        ]
+        # Personality traits (only the vibe varies per frame)
+        paste_centered_text(img, L.y(1260), f"Vibe: {data.get('vibe', 'Unique')}", L.s(50),
+                            '#CCCCCC')
         
-        y = 1100
-        for trait in traits:
-            bbox = draw.textbbox((0, 0), trait, font=desc_font)
-            x = (self.width - (bbox[2] - bbox[0])) // 2
-            draw.text((x, y), trait, fill='#CCCCCC', font=desc_font)
-            y += 80
-        
-        path = f"temp/reveal_{model}_{datetime.now().timestamp()}.png"
-        img.save(path)
-        return path
+        return self.save_frame(img, self.temp_frame_path(f"reveal_{model}"))
     
     def create_split_screen(self, model_data, title=""):
         """Create split screen comparison"""
         img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
         draw = ImageDraw.Draw(img)
+        L = self.layout
         
         # Title
         if title:
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-            except:
-                font = ImageFont.load_default()
-            
-            bbox = draw.textbbox((0, 0), title, font=font)
-            x = (self.width - (bbox[2] - bbox[0])) // 2
-            draw.text((x, 80), title, fill='#FFFFFF', font=font)
+            paste_centered_text(img, L.y(80), title, L.s(60))
         
         # 2x2 grid
         positions = [(0, 0), (1, 0), (0, 1), (1, 1)]
         cell_w = self.width // 2
-        cell_h = (self.height - 200) // 2
+        cell_h = (self.height - L.y(200)) // 2
         
         for i, (model, data) in enumerate(model_data.items()):
             if i >= 4:
@@ -320,95 +492,314 @@ class ViralContentPipeline:
                 
             col, row = positions[i]
             x = col * cell_w
-            y = 200 + row * cell_h
+            y = L.y(200) + row * cell_h
             
             # Model label
             model_color = self.models[model]['color']
-            draw.rectangle([x+10, y+10, x+cell_w-10, y+60],
+            draw.rectangle([x+L.s(10), y+L.s(10), x+cell_w-L.s(10), y+L.s(60)],
                           fill=model_color)
-            draw.text((x+20, y+20), model.upper(), fill='#FFFFFF')
+            draw.text((x+L.s(20), y+L.s(20)), model.upper(), fill='#FFFFFF')
             
             # Mini preview
-            preview_box = [x+20, y+70, x+cell_w-20, y+cell_h-20]
-            draw.rectangle(preview_box, outline=model_color, width=3)
+            preview_box = [x+L.s(20), y+L.s(70), x+cell_w-L.s(20), y+cell_h-L.s(20)]
+            draw.rectangle(preview_box, outline=model_color, width=L.s(3))
         
-        path = f"temp/split_{datetime.now().timestamp()}.png"
-        img.save(path)
-        return path
+        return self.save_frame(img, self.temp_frame_path("split"))
     
-    def create_video(self, frames, durations, output_name):
-        """Create final video from frames"""
-        # Create concat file
-        concat_file = "temp/concat.txt"
-        with open(concat_file, 'w') as f:
-            for frame, duration in zip(frames, durations):
-                f.write(f"file '{os.path.abspath(frame)}'\n")
-                f.write(f"duration {duration}\n")
-            # Last frame
-            f.write(f"file '{os.path.abspath(frames[-1])}'\n")
+    def create_video(self, frames, durations, output_name, cleanup=True, threads=None,
+                     effects=None, transition=None, transition_duration=0.5,
+                     outputs=None, fit='pad'):
+        """Create final video from frames
+        
+        threads caps the encoder's thread count (see EncodeScheduler).
+        effects optionally gives a motion effect per frame (see motion_effects).
+        transition blends consecutive frames with FFmpeg xfade (see transitions);
+        it can't be combined with effects.
+        outputs (e.g. ['9:16', '1:1', '16:9']) encodes every size from one
+        FFmpeg split graph and returns {label: path} (see multi_output). The
+        extra sizes are these frames letterboxed, cropped or blur-filled per
+        `fit`; a pipeline built with size='1:1' composes a native 1:1 cut.
+        """
+        if effects and any(effects) and transition:
+            raise ValueError("effects and transition can't be combined")
         
         # Output path
-        output_path = f"output/{output_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-        
-        # FFmpeg command
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', concat_file,
-            '-vf', f'fps={self.fps},format=yuv420p',
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '23',
-            output_path
-        ]
-        
-        subprocess.run(cmd, check=True)
+        output_path = f"output/{output_name}_{output_stamp()}.mp4"
+        
+        # Every aspect ratio from the same frames in one FFmpeg process
+        if outputs:
+            if (effects and any(effects)) or transition:
+                raise ValueError("outputs can't be combined with effects or transitions")
+            paths = pipe_frames_to_outputs(frames, durations, output_path, outputs,
+                                           self.width, self.height, self.fps, self.pix_fmt,
+                                           threads, still=self.still_vfr, fit=fit)
+            print(f"\n✅ Videos created: {', '.join(paths.values())}")
+            if cleanup:
+                self.cleanup_frames(frames)
+            return paths
+        
+        # Animated frames are rendered by FFmpeg filter graphs, one segment each
+        if effects and any(effects):
+            with self.workspace.scratch_dir('motion_') as segment_dir:
+                render_slideshow_with_motion(frames, durations, effects, output_path,
+                                             os.path.join(segment_dir, "segments.txt"),
+                                             self.fps, self.width, self.height, threads=threads,
+                                             segment_dir=segment_dir, background='#0a0a0a')
+            print(f"\n✅ Video created: {output_path}")
+            if cleanup:
+                self.cleanup_frames(frames)
+            return output_path
+        
+        # Transitions: all frames chained through xfade in one filter graph
+        if transition:
+            with self.workspace.scratch_dir('xfade_') as temp_dir:
+                render_xfade_slideshow(frames, durations, output_path, transition,
+                                       transition_duration, self.fps, self.width, self.height,
+                                       temp_dir=temp_dir, threads=threads)
+            print(f"\n✅ Video created: {output_path}")
+            if cleanup:
+                self.cleanup_frames(frames)
+            return output_path
+        
+        # Cached segments are stream-copied together, no re-encode
+        if self.segment_cache:
+            with self.workspace.scratch_file('segments_', '.txt') as list_path:
+                self.segment_cache.encode_video(frames, durations, output_path, list_path,
+                                                self.fps, self.width, self.height, threads)
+            print(f"\n✅ Video created: {output_path}")
+            if cleanup:
+                self.cleanup_frames(frames)
+            return output_path
+        
+        # In-memory frames go straight down a pipe, no concat file needed
+        if self.in_memory or any(isinstance(f, Image.Image) for f in frames):
+            pipe_frames_to_video(frames, durations, output_path,
+                                 self.width, self.height, self.fps, self.pix_fmt, threads,
+                                 still=self.still_vfr)
+            print(f"\n✅ Video created: {output_path}")
+            if cleanup:
+                self.cleanup_frames(frames)
+            return output_path
+        
+        # Create concat file (one per call: scheduled encodes run concurrently)
+        with self.workspace.scratch_file('concat_', '.txt') as concat_file:
+            with open(concat_file, 'w') as f:
+                for frame, duration in zip(frames, durations):
+                    f.write(f"file '{os.path.abspath(frame)}'\n")
+                    f.write(f"duration {duration}\n")
+                # Last frame
+                f.write(f"file '{os.path.abspath(frames[-1])}'\n")
+            
+            # FFmpeg command
+            cmd = [
+                'ffmpeg', '-y',
+                '-f', 'concat',
+                '-safe', '0',
+                '-i', concat_file,
+                *slideshow_rate_args(self.fps, self.still_vfr),
+                '-c:v', 'libx264',
+                '-preset', 'fast',
+                '-crf', '23',
+                *(['-threads', str(threads)] if threads else []),
+                output_path
+            ]
+            
+            subprocess.run(cmd, check=True)
         print(f"\n✅ Video created: {output_path}")
         
         # Cleanup
-        for frame in frames:
-            if os.path.exists(frame):
-                os.remove(frame)
+        if cleanup:
+            self.cleanup_frames(frames)
         
         return output_path
     
-    def quick_produce(self, model_htmls, storyline=1):
-        """Main method to quickly produce a video"""
-        
-        print(f"\n🎬 Starting viral content production...")
-        print(f"📖 Using storyline {storyline}")
-        
-        # Step 1: Capture screenshots
-        model_data = {}
-        for model, html_path in model_htmls.items():
-            print(f"\n📸 Processing {model}...")
-            
-            screenshot_path = f"screenshots/{model}_{self.project_name}.png"
-            self.capture_screenshot(html_path, screenshot_path)
-            
-            model_data[model] = {
+    def cleanup_frames(self, frames):
+        """Remove temp frame files (in-memory frames need no cleanup)"""
+        for frame in frames:
+            if isinstance(frame, str) and os.path.exists(frame):
+                os.remove(frame)
+    
+    def prepare_model_data(self, model_htmls):
+        """Capture screenshots and analyze vibes once for every model"""
+        print(f"\n📸 Capturing {len(model_htmls)} screenshots...")
+        with self.tracer.span('capture_screenshots', models=len(model_htmls)):
+            screenshots = self.capture_screenshots(model_htmls)
+        
+        with self.tracer.span('analyze_vibe'):
+            return self.describe_models(model_htmls, screenshots)
+    
+    def describe_models(self, model_htmls, screenshots=None):
+        """Per-model data for planning; screenshots may still be in flight"""
+        screenshots = screenshots or {}
+        return {
+            model: {
                 'html': html_path,
-                'screenshot': screenshot_path,
+                'screenshot': screenshots.get(model, self.screenshot_path(model)),
                 'vibe': self.analyze_vibe(html_path)
             }
-        
-        # Step 2: Create frames based on storyline
+            for model, html_path in model_htmls.items()
+        }
+    
+    def plan_storyline(self, storyline, model_data):
+        """Frame jobs, durations and output name for a storyline number"""
         if storyline == 1:
-            frames, durations = self.create_storyline_1_personality(model_data)
+            jobs, durations = self.plan_storyline_1_personality(model_data)
             output_name = f"{self.project_name}_personality"
         elif storyline == 2:
-            frames, durations = self.create_storyline_2_plot_twist(model_data)
+            jobs, durations = self.plan_storyline_2_plot_twist(model_data)
             output_name = f"{self.project_name}_plot_twist"
         else:
-            frames, durations = self.create_storyline_3_competition(model_data)
+            jobs, durations = self.plan_storyline_3_competition(model_data)
             output_name = f"{self.project_name}_competition"
+        return jobs, durations, output_name
+    
+    def quick_produce(self, model_htmls, storyline=1, outputs=None):
+        """Main method to quickly produce a video
         
-        # Step 3: Create video
-        video_path = self.create_video(frames, durations, output_name)
+        outputs (e.g. ['9:16', '1:1']) also writes other aspect ratios in the
+        same encode pass; the result is then {label: path}.
+        """
+        
+        print(f"\n🎬 Starting viral content production...")
+        print(f"📖 Using storyline {storyline}")
+        
+        with self.tracer.span('quick_produce', cat='root', storyline=storyline):
+            # Step 1: Capture screenshots
+            model_data = self.prepare_model_data(model_htmls)
+            
+            # Step 2: Create frames based on storyline
+            jobs, durations, output_name = self.plan_storyline(storyline, model_data)
+            with self.tracer.span('render_frames', frames=len(jobs)):
+                frames = self.render_frames(jobs)
+            
+            # Step 3: Create video
+            with self.tracer.span('encode', output=output_name):
+                video_path = self.create_video(frames, durations, output_name, outputs=outputs)
+        
+        if self.tracer.enabled:
+            self.tracer.finish()
         
         return video_path
     
+    async def quick_produce_async(self, model_htmls, storyline=1):
+        """quick_produce with capture, render and encode overlapped
+        
+        Every model is captured as its own task. Frames that need no screenshot
+        render straight away, model frames as soon as their screenshots land,
+        and the encoder is fed in timeline order as each prefix completes.
+        Always encodes through the frame pipe (no effects/transitions).
+        
+            asyncio.run(pipeline.quick_produce_async(model_htmls, storyline=2))
+        """
+        print(f"\n🎬 Starting viral content production (overlapped)...")
+        print(f"📖 Using storyline {storyline}")
+        
+        loop = asyncio.get_running_loop()
+        tracer = self.tracer
+        
+        # Launch the shared browser before capture tasks race to start it
+        if self.capture_backend == 'browser':
+            self.get_browser_pool()
+        
+        render_executor = (self.get_render_pool() if self.render_workers
+                           else ThreadPoolExecutor(max_workers=os.cpu_count() or 4))
+        
+        def capture(model, html_path):
+            with tracer.span(f"capture {model}", cat='capture'):
+                return self.capture_screenshots({model: html_path})
+        
+        async def render(job):
+            for model in job.needs:
+                await captures[model]
+            with tracer.span(job.method, cat='frame', needs=','.join(job.needs)):
+                return await loop.run_in_executor(render_executor, render_frame_job, self, job)
+        
+        with tracer.span('quick_produce_async', cat='root', storyline=storyline):
+            # Output paths and vibes don't depend on the captures, so plan first
+            model_data = self.describe_models(model_htmls)
+            jobs, durations, output_name = self.plan_storyline(storyline, model_data)
+            
+            print(f"\n📸 Capturing {len(model_htmls)} screenshots, "
+                  f"rendering {len(jobs)} frames as inputs arrive...")
+            captures = {
+                model: asyncio.ensure_future(asyncio.to_thread(capture, model, html_path))
+                for model, html_path in model_htmls.items()
+            }
+            renders = [asyncio.ensure_future(render(job)) for job in jobs]
+            
+            output_path = f"output/{output_name}_{output_stamp()}.mp4"
+            fps, tune = self.fps, None
+            if self.still_vfr:
+                fps, tune = still_frame_rate(durations, self.fps), 'stillimage'
+            
+            frames = []
+            try:
+                with FramePipeWriter(output_path, self.width, self.height, fps, self.pix_fmt,
+                                     tune=tune) as writer:
+                    for task, duration in zip(renders, durations):
+                        frame = await task
+                        frames.append(frame)
+                        with tracer.span('pipe_write', cat='encode'):
+                            await asyncio.to_thread(writer.write_frame, frame, duration)
+                    
+                    with tracer.span('encode'):
+                        await asyncio.to_thread(writer.close)
+                
+                # Screenshots are finished by now; wait for their cache writes too
+                await asyncio.gather(*captures.values())
+            finally:
+                for task in renders:
+                    task.cancel()
+                if not self.render_workers:
+                    render_executor.shutdown(wait=False, cancel_futures=True)
+                self.cleanup_frames(frames)
+        
+        print(f"\n✅ Video created: {output_path}")
+        
+        if tracer.enabled:
+            tracer.finish()
+        
+        return output_path
+    
+    def produce_all(self, model_htmls, storylines=(1, 2, 3), outputs=None):
+        """Produce several storylines from one capture/analysis stage
+        
+        Screenshots and vibes are shared; the storylines have no frames in
+        common, but all of their frames go to the renderer as one batch so a
+        render pool stays busy across storyline boundaries.
+        
+        Returns {storyline: video_path}, or {storyline: {label: path}} with outputs.
+        """
+        print(f"\n🎬 Starting viral content production...")
+        print(f"📖 Using storylines {', '.join(str(s) for s in storylines)}")
+        
+        with self.tracer.span('produce_all', cat='root', storylines=len(storylines)):
+            # Step 1: Capture and analyze once for every storyline
+            model_data = self.prepare_model_data(model_htmls)
+            
+            # Step 2: Every storyline's frames in one render batch
+            plans = {s: self.plan_storyline(s, model_data) for s in storylines}
+            all_jobs = [job for jobs, _, _ in plans.values() for job in jobs]
+            
+            print(f"\n🖼️ Rendering {len(all_jobs)} frames for {len(plans)} storylines")
+            with self.tracer.span('render_frames', frames=len(all_jobs)):
+                rendered = self.render_frames(all_jobs)
+            
+            # Step 3: One encode per storyline, each over its slice of the batch
+            videos = {}
+            start = 0
+            for storyline, (jobs, durations, output_name) in plans.items():
+                frames = rendered[start:start + len(jobs)]
+                start += len(jobs)
+                with self.tracer.span('encode', output=output_name):
+                    videos[storyline] = self.create_video(frames, durations, output_name,
+                                                          outputs=outputs)
+        
+        if self.tracer.enabled:
+            self.tracer.finish()
+        
+        return videos
+    
     def analyze_vibe(self, html_path):
         """Quick analysis of HTML to determine vibe"""
         try:
@@ -429,164 +820,98 @@ class ViralContentPipeline:
     def create_equation_frame(self, text, equation):
         """Create frame showing the equation"""
         img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
-        draw = ImageDraw.Draw(img)
         
-        try:
-            text_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-            eq_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 100)
-        except:
-            text_font = ImageFont.load_default()
-            eq_font = text_font
+        L = self.layout
         
         # Text
-        bbox = draw.textbbox((0, 0), text, font=text_font)
-        x = (self.width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, 600), text, fill='#FFFFFF', font=text_font)
-        
-        # Equation with glow
-        bbox = draw.textbbox((0, 0), equation, font=eq_font)
-        x = (self.width - (bbox[2] - bbox[0])) // 2
-        
-        # Glow effect
-        for offset in range(5, 0, -1):
-            alpha = int(255 * (1 - offset/5) * 0.3)
-            draw.text((x, 800), equation, 
-                     fill=(100, 200, 255, alpha), font=eq_font)
+        paste_centered_text(img, L.y(600), text, L.s(60))
         
-        draw.text((x, 800), equation, fill='#FFFFFF', font=eq_font)
+        # Equation with a blue glow underlay, composited into the sprite
+        paste_centered_text(img, L.y(800), equation, L.s(100), glow=((100, 200, 255), 0))
         
-        path = f"temp/equation_{datetime.now().timestamp()}.png"
-        img.save(path)
-        return path
+        return self.save_frame(img, self.temp_frame_path("equation"))
     
     def create_dramatic_reveal(self, model, data, reaction):
         """Create dramatic reveal with reaction text"""
-        img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
-        draw = ImageDraw.Draw(img)
+        # Model name comes from the template
+        img = self.frame_template(model, 'dramatic')
         
         model_color = self.models[model]['color']
-        
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-            big_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 70)
-        except:
-            font = ImageFont.load_default()
-            big_font = font
-        
-        # Model name
-        draw.text((50, 100), model.upper(), fill=model_color, font=big_font)
+        L = self.layout
         
         # Screenshot (if available)
         if 'screenshot' in data and os.path.exists(data['screenshot']):
-            ss = Image.open(data['screenshot'])
-            ss.thumbnail((900, 600), Image.Resampling.LANCZOS)
+            ss = load_fitted(data['screenshot'], (L.x(900), L.y(600)))
             x_offset = (self.width - ss.width) // 2
+            top, border = L.y(300), L.s(5)
             
-            # Add dramatic border
-            bordered = Image.new('RGB', (ss.width + 10, ss.height + 10), model_color)
-            bordered.paste(ss, (5, 5))
-            img.paste(bordered, (x_offset - 5, 300))
+            # Add dramatic border: colored fill just behind the screenshot
+            img.paste(model_color, (x_offset - border, top,
+                                    x_offset + ss.width + border, top + ss.height + 2 * border))
+            img.paste(ss, (x_offset, top + border))
         
         # Reaction text
-        bbox = draw.textbbox((0, 0), reaction, font=font)
-        x = (self.width - (bbox[2] - bbox[0])) // 2
-        draw.text((x, 1100), reaction, fill='#FFD700', font=font)
+        paste_centered_text(img, L.y(1100), reaction, L.s(50), '#FFD700')
         
-        path = f"temp/dramatic_{model}_{datetime.now().timestamp()}.png"
-        img.save(path)
-        return path
+        return self.save_frame(img, self.temp_frame_path(f"dramatic_{model}"))
     
     def create_scoring_frame(self, model, data, scores):
         """Create scoring frame for competition"""
-        img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
+        # Model name and preview box come from the template
+        img = self.frame_template(model, 'scoring')
         draw = ImageDraw.Draw(img)
         
         model_info = self.models[model]
+        L = self.layout
         
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-            score_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-        except:
-            title_font = ImageFont.load_default()
-            score_font = title_font
-        
-        # Model name
-        draw.text((100, 100), model.upper(), fill=model_info['color'], font=title_font)
-        
-        # Screenshot preview
-        preview_y = 250
-        preview_h = 500
-        draw.rectangle([100, preview_y, 980, preview_y + preview_h],
-                      outline=model_info['color'], width=5)
-        draw.text((540, preview_y + 250), "[PREVIEW]", fill='#666', anchor='mm')
+        preview_y = L.y(250)
+        preview_h = L.y(500)
         
         # Scores
-        y = preview_y + preview_h + 100
+        y = preview_y + preview_h + L.y(100)
         total = 0
         
         for category, score in scores.items():
             # Score bar
-            bar_width = int((score / 10) * 700)
-            draw.rectangle([200, y, 200 + bar_width, y + 40],
+            bar_width = int((score / 10) * L.x(700))
+            draw.rectangle([L.x(200), y, L.x(200) + bar_width, y + L.s(40)],
                           fill=model_info['color'])
             
             # Label and score
-            draw.text((100, y + 5), category.capitalize() + ":", 
-                     fill='#FFFFFF', font=score_font)
-            draw.text((920, y + 5), f"{score}/10", 
-                     fill='#FFFFFF', font=score_font)
+            paste_text(img, (L.x(100), y + L.s(5)), category.capitalize() + ":", L.s(60))
+            paste_text(img, (L.x(920), y + L.s(5)), f"{score}/10", L.s(60))
             
             total += score
-            y += 80
+            y += L.y(80)
         
         # Total score
-        draw.text((100, y + 50), f"TOTAL: {total}/30", 
-                 fill='#FFD700', font=title_font)
+        paste_text(img, (L.x(100), y + L.y(50)), f"TOTAL: {total}/30", L.s(80), '#FFD700')
         
-        path = f"temp/scoring_{model}_{datetime.now().timestamp()}.png"
-        img.save(path)
-        return path
+        return self.save_frame(img, self.temp_frame_path(f"scoring_{model}"))
     
     def create_winner_frame(self):
         """Create winner announcement frame"""
-        img = Image.new('RGB', (self.width, self.height), '#0a0a0a')
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 100)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-        except:
-            font = ImageFont.load_default()
-            small_font = font
-        
         # Drum roll effect with gradient background
-        for i in range(self.height):
-            intensity = int(20 + 30 * abs(i - self.height/2) / (self.height/2))
-            draw.rectangle([0, i, self.width, i+1], 
-                          fill=(intensity, intensity, intensity))
+        img = gradient_background((self.width, self.height), 'drumroll',
+                                  (20, 20, 20), (50, 50, 50))
         
         # Winner text
         texts = [
-            ("And the winner is...", small_font, 600),
-            ("🥁 🥁 🥁", font, 800),
-            ("YOU DECIDE!", font, 1000),
-            ("Vote in comments!", small_font, 1200)
+            ("And the winner is...", 60, 600),
+            ("🥁 🥁 🥁", 100, 800),
+            ("YOU DECIDE!", 100, 1000),
+            ("Vote in comments!", 60, 1200)
         ]
         
-        for text, text_font, y in texts:
-            bbox = draw.textbbox((0, 0), text, font=text_font)
-            x = (self.width - (bbox[2] - bbox[0])) // 2
-            
+        L = self.layout
+        for text, size, y in texts:
             # Gold text for winner announcement
             if "YOU DECIDE" in text:
-                draw.text((x+3, y+3), text, fill='#000', font=text_font)
-                draw.text((x, y), text, fill='#FFD700', font=text_font)
+                paste_centered_text(img, L.y(y), text, L.s(size), '#FFD700', shadow=TEXT_SHADOW)
             else:
-                draw.text((x, y), text, fill='#FFFFFF', font=text_font)
+                paste_centered_text(img, L.y(y), text, L.s(size))
         
-        path = f"temp/winner_{datetime.now().timestamp()}.png"
-        img.save(path)
-        return path
+        return self.save_frame(img, self.temp_frame_path("winner"))
 
 
 # Example usage
@@ -637,12 +962,11 @@ if __name__ == "__main__":
     # Produce videos for all 3 storylines
     print("\n🎬 Creating viral videos for all 3 storylines...\n")
     
-    for storyline in [1, 2, 3]:
-        print(f"\n{'='*50}")
-        print(f"Creating Storyline {storyline}")
-        print(f"{'='*50}")
-        
-        video_path = pipeline.quick_produce(model_htmls, storyline=storyline)
+    # Screenshots, vibe analysis and shared frames are done once for all three
+    videos = pipeline.produce_all(model_htmls, storylines=[1, 2, 3])
+    pipeline.close()
+    
+    for storyline, video_path in videos.items():
         print(f"✅ Storyline {storyline} complete: {video_path}")
     
     print("\n🎉 All videos created successfully!")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Per-job scratch workspaces, RAM-backed when possible
+Every pipeline/creator gets its own directory for intermediate frames,
+concat lists and segments, so parallel runs never share paths. The
+directory lives on /dev/shm when it has room, has a size cap, and is
+removed on close() (or at interpreter exit at the latest).
+
+AUTOMATION_SCRATCH overrides the root directory.
+"""
+
+import os
+import errno
+import shutil
+import tempfile
+import weakref
+from uuid import uuid4
+from datetime import datetime
+from contextlib import contextmanager
+
+SCRATCH_ENV = 'AUTOMATION_SCRATCH'
+RAM_ROOT = '/dev/shm'
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def default_scratch_root(max_bytes=DEFAULT_MAX_BYTES):
+    """$AUTOMATION_SCRATCH, else /dev/shm if it can hold max_bytes, else the system temp dir"""
+    root = os.environ.get(SCRATCH_ENV)
+    if root:
+        return root
+
+    if os.path.isdir(RAM_ROOT) and os.access(RAM_ROOT, os.W_OK):
+        if shutil.disk_usage(RAM_ROOT).free >= (max_bytes or 0):
+            return RAM_ROOT
+    return tempfile.gettempdir()
+
+
+def output_stamp():
+    """Timestamp for output names, with a random suffix so two encodes of the
+    same name in the same second never write the same file"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:6]}"
+
+
+def directory_bytes(path):
+    """Total size of the files under `path`"""
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total += directory_bytes(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+class Workspace:
+    """Private scratch directory for one job
+
+    path_for() hands out fixed paths inside it; unique_path(), scratch_file()
+    and scratch_dir() hand out names no concurrent call shares, for anything
+    written per encode. All of them enforce max_bytes (None = no cap): once the files already written exceed the cap, the next request
+    fails with ENOSPC instead of filling RAM. Copies sent to render worker
+    processes share the directory but never delete it.
+    """
+
+    def __init__(self, name='job', root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.root = root or default_scratch_root(max_bytes)
+        os.makedirs(self.root, exist_ok=True)
+
+        safe = "".join(c if c.isalnum() or c in '-_' else '_' for c in name)
+        self.path = tempfile.mkdtemp(prefix=f"{safe}_", dir=self.root)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.path, True)
+
+    @property
+    def closed(self):
+        return not os.path.isdir(self.path)
+
+    def usage(self):
+        return directory_bytes(self.path)
+
+    def check(self, incoming=0):
+        """Raise ENOSPC if the workspace (plus `incoming` bytes) is over its cap"""
+        if self.max_bytes is None:
+            return
+        used = self.usage()
+        if used + incoming > self.max_bytes:
+            raise OSError(errno.ENOSPC,
+                          f"Workspace over its {self.max_bytes} byte cap ({used} used)",
+                          self.path)
+
+    def path_for(self, *parts):
+        """Path inside the workspace (parent directories are created)"""
+        self.check()
+        path = os.path.join(self.path, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def unique_path(self, prefix='', suffix=''):
+        """New empty file with a name no other call, thread or process gets"""
+        self.check()
+        fd, path = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=self.path)
+        os.close(fd)
+        return path
+
+    @contextmanager
+    def scratch_file(self, prefix='', suffix=''):
+        """unique_path() for the duration of a block, removed afterwards"""
+        path = self.unique_path(prefix, suffix)
+        try:
+            yield path
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    @contextmanager
+    def scratch_dir(self, prefix=''):
+        """Private directory for one call (e.g. one encode's segments), removed afterwards"""
+        self.check()
+        path = tempfile.mkdtemp(prefix=prefix, dir=self.path)
+        try:
+            yield path
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def subdir(self, *parts):
+        path = os.path.join(self.path, *parts)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def clear(self):
+        """Remove everything written so far, keep the workspace"""
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.remove(entry.path)
+
+    def close(self):
+        """Delete the workspace (no-op for worker copies and when already closed)"""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __getstate__(self):
+        # Only the creating process owns (and deletes) the directory
+        state = self.__dict__.copy()
+        state['_finalizer'] = None
+        return state